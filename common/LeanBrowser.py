@@ -0,0 +1,250 @@
+import threading
+
+# URL patterns blocked in Chromium through CDP (Network.setBlockedURLs).
+# The scrapers only read text and attributes, so none of these are needed.
+BLOCKED_RESOURCES = [
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.avif",
+    "*.svg",
+    "*.ico",
+    "*.mp4",
+    "*.webm",
+    "*.m3u8",
+    "*.m4s",
+    "*.mp3",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+]
+
+# Analytics, ads and tracking hosts requested by X, Reddit and Etsy pages.
+TRACKER_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "google.com/recaptcha",
+    "facebook.net",
+    "facebook.com/tr",
+    "bat.bing.com",
+    "scorecardresearch.com",
+    "hotjar.com",
+    "segment.io",
+    "sentry.io",
+    "branch.io",
+    "ads-twitter.com",
+    "ads-api.twitter.com",
+    "analytics.twitter.com",
+    "pinimg.com",
+    "pinterest.com/ct",
+    "criteo.com",
+    "adnxs.com",
+    "amazon-adsystem.com",
+]
+
+# Sums the requests and bytes the page has made since the previous call. The
+# navigation request itself is counted once per document. Cross-origin
+# responses without Timing-Allow-Origin report a transferSize of 0, so bytes
+# are a lower bound.
+PAGE_STATS_JS = """
+const resources = performance.getEntriesByType('resource');
+let requests = resources.length;
+let bytes = 0;
+for (const entry of resources) {
+    bytes += entry.transferSize || 0;
+}
+if (!window.__leanCounted) {
+    window.__leanCounted = true;
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (nav) {
+        requests += 1;
+        bytes += nav.transferSize || 0;
+    }
+}
+performance.clearResourceTimings();
+performance.setResourceTimingBufferSize(100000);
+return {requests: requests, bytes: bytes};
+"""
+
+
+class LeanBrowser:
+    """A lightweight browser profile shared by the Selenium scrapers.
+
+    It runs the browser headless and keeps it from downloading images, media,
+    fonts and known analytics hosts:
+
+    - Chrome (including selenium-wire): images are disabled in the profile and
+      attach() blocks BLOCKED_RESOURCES and TRACKER_HOSTS through CDP, so
+      blocked requests never leave the browser (nor reach a proxy).
+    - Firefox: images, web fonts and autoplay are disabled through prefs and
+      tracking protection blocks the analytics hosts.
+
+    record() measures the requests and bytes each page actually made. Running
+    the same scrape with block=False gives the baseline, and savings() compares
+    the two.
+
+    Attributes:
+        headless: Run the browser without a window.
+        block: Block resources at all. False keeps a normal profile, for baselines.
+        patterns: The URL patterns blocked through CDP.
+        pages: Page -> {"requests": int, "bytes": int} measured so far.
+    """
+
+    def __init__(
+        self, headless: bool = True, block: bool = True, extra_patterns: list = ()
+    ) -> None:
+        """
+        Args:
+            headless: Run the browser without a window.
+            block: Block images, media, fonts and trackers.
+            extra_patterns: More URL patterns to block in Chrome, e.g. "*/ads/*".
+        """
+        self.headless = headless
+        self.block = block
+        self.patterns = (
+            BLOCKED_RESOURCES
+            + [f"*{host}*" for host in TRACKER_HOSTS]
+            + list(extra_patterns)
+        )
+        self.pages = {}
+        self.lock = threading.Lock()
+
+    def chrome_options(self, options=None):
+        """
+        Apply the profile to ChromeOptions.
+
+        Args:
+            options: Existing options to extend, or None to create new ones.
+
+        Returns:
+            The options.
+        """
+        if options is None:
+            from selenium.webdriver import ChromeOptions
+
+            options = ChromeOptions()
+
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1920,1080")
+        if self.block:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_argument("--autoplay-policy=user-gesture-required")
+            options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        return options
+
+    def firefox_options(self, options=None):
+        """
+        Apply the profile to FirefoxOptions.
+
+        Args:
+            options: Existing options to extend, or None to create new ones.
+
+        Returns:
+            The options.
+        """
+        if options is None:
+            from selenium.webdriver import FirefoxOptions
+
+            options = FirefoxOptions()
+
+        if self.headless:
+            options.add_argument("-headless")
+        if self.block:
+            options.set_preference("permissions.default.image", 2)
+            options.set_preference("gfx.downloadable_fonts.enabled", False)
+            options.set_preference("media.autoplay.default", 5)
+            options.set_preference("media.autoplay.blocking_policy", 2)
+            options.set_preference("privacy.trackingprotection.enabled", True)
+        return options
+
+    def attach(self, driver) -> None:
+        """
+        Start blocking requests in a running Chromium driver. No-op for Firefox.
+        """
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return
+        # Keep every resource timing entry until record() reads them
+        driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument",
+            {"source": "performance.setResourceTimingBufferSize(100000);"},
+        )
+        if not self.block:
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+
+    def record(self, driver, page: str = None) -> dict:
+        """
+        Add the requests and bytes made by the current page since the last call.
+
+        Call it after a page has loaded, and again after scrolling when the page
+        keeps loading content, so the browser's timing buffer never fills up.
+
+        Args:
+            driver: The WebDriver.
+            page: Label to aggregate under. Defaults to the current URL.
+
+        Returns:
+            dict: The requests and bytes counted by this call.
+        """
+        try:
+            measured = driver.execute_script(PAGE_STATS_JS)
+        except Exception as e:
+            print(f"Could not read page stats: {e}")
+            return {"requests": 0, "bytes": 0}
+
+        page = page or driver.current_url
+        with self.lock:
+            totals = self.pages.setdefault(page, {"requests": 0, "bytes": 0})
+            totals["requests"] += measured["requests"]
+            totals["bytes"] += measured["bytes"]
+        return measured
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: pages, total requests and bytes, and their means per page.
+        """
+        with self.lock:
+            pages = len(self.pages)
+            requests = sum(page["requests"] for page in self.pages.values())
+            bytes_ = sum(page["bytes"] for page in self.pages.values())
+        return {
+            "pages": pages,
+            "requests": requests,
+            "bytes": bytes_,
+            "requests_per_page": round(requests / pages, 1) if pages else 0,
+            "bytes_per_page": round(bytes_ / pages) if pages else 0,
+        }
+
+    def savings(self, baseline: "LeanBrowser") -> dict:
+        """
+        Compare this profile's per-page costs with a baseline run (block=False).
+
+        Returns:
+            dict: Requests and bytes saved per page.
+        """
+        ours, theirs = self.stats(), baseline.stats()
+        return {
+            "requests_saved_per_page": round(
+                theirs["requests_per_page"] - ours["requests_per_page"], 1
+            ),
+            "bytes_saved_per_page": theirs["bytes_per_page"] - ours["bytes_per_page"],
+        }
+
+    def report(self) -> None:
+        """Print the measured requests and bytes per page."""
+        stats = self.stats()
+        print(
+            f"{stats['pages']} pages: {stats['requests_per_page']} requests, "
+            f"{stats['bytes_per_page'] / 1024:.0f} KiB per page"
+            f"{'' if self.block else ' (no blocking)'}"
+        )
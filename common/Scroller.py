@@ -0,0 +1,260 @@
+import time
+
+# Scrolls the page and resolves as soon as the feed reacts: a new card (or, with
+# no card selector, any element) is inserted or the document grows. Resolves
+# with grew=false once the timeout expires. When the viewport is not at the
+# bottom yet there is nothing to wait for, so the shorter settle timeout is used.
+SCROLL_AND_WAIT_JS = """
+const selector = arguments[0];
+const by = arguments[1];
+const timeoutMs = arguments[2];
+const settleMs = arguments[3];
+const done = arguments[arguments.length - 1];
+
+const root = document.documentElement;
+const startHeight = root.scrollHeight;
+let finished = false;
+let timer = null;
+
+function atBottom() {
+    return window.innerHeight + window.pageYOffset >= root.scrollHeight - 2;
+}
+
+function count() {
+    return selector ? document.querySelectorAll(selector).length : 0;
+}
+
+function finish(grew) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done({
+        grew: grew,
+        atBottom: atBottom(),
+        cards: count(),
+        height: root.scrollHeight,
+        offset: window.pageYOffset,
+    });
+}
+
+const observer = new MutationObserver((mutations) => {
+    for (const mutation of mutations) {
+        for (const node of mutation.addedNodes) {
+            if (node.nodeType !== Node.ELEMENT_NODE) {
+                continue;
+            }
+            if (!selector || node.matches(selector) || node.querySelector(selector)) {
+                finish(true);
+                return;
+            }
+        }
+    }
+    if (root.scrollHeight > startHeight) {
+        finish(true);
+    }
+});
+observer.observe(document.body, {childList: true, subtree: true});
+
+if (by === null) {
+    window.scrollTo(0, root.scrollHeight);
+} else {
+    window.scrollBy(0, by);
+}
+timer = setTimeout(() => finish(false), atBottom() ? timeoutMs : settleMs);
+"""
+
+# Resolves once at least arguments[1] elements match the selector, or on timeout.
+WAIT_FOR_CARDS_JS = """
+const selector = arguments[0];
+const minCount = arguments[1];
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+
+function count() {
+    return document.querySelectorAll(selector).length;
+}
+
+if (count() >= minCount) {
+    done(count());
+} else {
+    const observer = new MutationObserver(() => {
+        if (count() >= minCount) {
+            observer.disconnect();
+            clearTimeout(timer);
+            done(count());
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        done(count());
+    }, timeoutMs);
+    observer.observe(document.body, {childList: true, subtree: true});
+}
+"""
+
+
+class Scroller:
+    """Adaptive scrolling shared by the feed scrapers.
+
+    Instead of sleeping a fixed amount after every scroll, each scroll waits in the
+    browser (MutationObserver) until new cards are inserted or the page grows, and
+    returns as soon as that happens. A feed is considered exhausted after
+    `patience` consecutive scrolls at the bottom of the page that load nothing.
+
+    Attributes:
+        driver: The Selenium WebDriver to scroll.
+        card_selector: CSS selector of the feed's cards, or None to react to any new element.
+        timeout: Seconds to wait for new content once the bottom of the page is reached.
+        settle: Seconds to wait for new content while there is still page left below.
+        patience: Consecutive empty scrolls at the bottom before scrolling is set to False.
+        scrolling: False once the feed is exhausted.
+        scroll_count: Number of scrolls since the last reset.
+        timings: Seconds spent waiting on each scroll since the last reset.
+    """
+
+    def __init__(
+        self,
+        driver,
+        card_selector: str = None,
+        timeout: float = 5.0,
+        settle: float = 0.5,
+        patience: int = 3,
+    ) -> None:
+        self.driver = driver
+        self.card_selector = card_selector
+        self.timeout = timeout
+        self.settle = settle
+        self.patience = patience
+
+        self.current_position = 0
+        self.last_position = driver.execute_script("return window.pageYOffset;")
+        self.scrolling = True
+        self.scroll_count = 0
+        self.idle = 0
+        self.grew_count = 0
+        self.timings = []
+
+    def reset(self) -> None:
+        """
+        Reset all scroll-related states to their initial values.
+        This includes setting current_position to 0, updating last_position,
+        and clearing the scrolling state and timing stats. Call it after loading a new page.
+        """
+        self.current_position = 0
+        self.last_position = self.driver.execute_script("return window.pageYOffset;")
+        self.scrolling = True
+        self.scroll_count = 0
+        self.idle = 0
+        self.grew_count = 0
+        self.timings = []
+
+    def scroll(self, by: int = None) -> bool:
+        """
+        Scroll and wait until the feed reacts or the timeout expires.
+
+        Args:
+            by: Pixels to scroll down by, or None to scroll to the bottom of the page.
+
+        Returns:
+            bool: True if new content appeared.
+        """
+        start = time.perf_counter()
+        result = self._execute_async(
+            self.timeout,
+            SCROLL_AND_WAIT_JS,
+            self.card_selector,
+            by,
+            int(self.timeout * 1000),
+            int(self.settle * 1000),
+        )
+        self.timings.append(time.perf_counter() - start)
+
+        self.scroll_count += 1
+        self.last_position = self.current_position
+        self.current_position = result["offset"]
+
+        if result["grew"]:
+            self.idle = 0
+            self.grew_count += 1
+        elif result["atBottom"]:
+            self.idle += 1
+            if self.idle >= self.patience:
+                self.scrolling = False
+
+        return result["grew"]
+
+    def wait_for_cards(self, min_count: int = 1, timeout: float = None) -> int:
+        """
+        Wait until at least min_count cards are on the page, e.g. right after a page load.
+
+        Args:
+            min_count: Number of cards to wait for.
+            timeout: Seconds to wait at most. Defaults to the scroller's timeout.
+
+        Returns:
+            int: The number of cards on the page when the wait ended.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        return self._execute_async(
+            timeout,
+            WAIT_FOR_CARDS_JS,
+            self.card_selector,
+            min_count,
+            int(timeout * 1000),
+        )
+
+    def _execute_async(self, timeout: float, script: str, *args):
+        """
+        Run an async script with a script timeout long enough for its own wait.
+
+        The driver's script timeout is shared with every other execute_async_script
+        caller, so the previous value is restored afterwards.
+        """
+        previous = self.driver.timeouts.script
+        self.driver.set_script_timeout(timeout + 5)
+        try:
+            return self.driver.execute_async_script(script, *args)
+        finally:
+            self.driver.set_script_timeout(previous)
+
+    def stats(self) -> dict:
+        """
+        Per-scroll timing stats since the last reset.
+
+        Returns:
+            dict: Number of scrolls, how many loaded new content, and the total,
+            mean and max seconds spent waiting.
+        """
+        total = sum(self.timings)
+        return {
+            "scrolls": self.scroll_count,
+            "grew": self.grew_count,
+            "wait_total": round(total, 3),
+            "wait_mean": round(total / len(self.timings), 3) if self.timings else 0.0,
+            "wait_max": round(max(self.timings), 3) if self.timings else 0.0,
+        }
+
+    def scroll_to_top(self) -> None:
+        """
+        Scroll the page to the top.
+        Note: This may reset the scroll_count and current_position.
+        """
+        self.driver.execute_script("window.scrollTo(0, 0);")
+
+    def scroll_to_bottom(self) -> None:
+        """
+        Scroll the page to the bottom without waiting.
+        Note: This may reset the scroll_count and current_position.
+        """
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+    def update_scroll_position(self) -> None:
+        """
+        Update the current scroll position using the driver.
+        Returns:
+            float: The current scroll position in pixels.
+        """
+        self.current_position = self.driver.execute_script("return window.pageYOffset;")
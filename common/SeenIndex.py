@@ -0,0 +1,97 @@
+import os
+import threading
+from collections import deque
+
+
+class SeenIndex:
+    """A deduplication index of post ids (tweet ids, shreddit post ids, ...).
+
+    Membership checks are plain set lookups, so they can be done before any field
+    of a card is extracted. Ids are only written to disk by flush(), which the
+    scrapers call after the matching rows have been saved; reopening the same
+    file therefore resumes a crawl without skipping posts that were never stored.
+    Updates are guarded by a lock so one index can be shared by several scrapers
+    running in parallel.
+
+    Attributes:
+        path: File the index is persisted to, one id per line, or None to keep it in memory.
+        ids: Every id seen so far, including the ones loaded from path.
+        recent: The most recently added ids, used to let the browser skip cards
+            that are still on screen.
+        pending: Ids added since the last flush.
+    """
+
+    def __init__(self, path: str = None, recent_size: int = 200) -> None:
+        """
+        Initialize the index and load any ids already stored at path.
+
+        Args:
+            path: (Optional) File to load from and persist to.
+            recent_size: Number of recently added ids kept in recent.
+        """
+        self.path = path
+        self.ids = set()
+        self.recent = deque(maxlen=recent_size)
+        self.pending = []
+        self.lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                self.ids.update(line.strip() for line in file if line.strip())
+
+    def __contains__(self, key) -> bool:
+        return key in self.ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, key: str) -> bool:
+        """
+        Add an id to the index.
+
+        Args:
+            key: The post id.
+
+        Returns:
+            bool: True if the id was new, False if it had already been seen.
+        """
+        with self.lock:
+            if key in self.ids:
+                return False
+
+            self.ids.add(key)
+            self.recent.append(key)
+            self.pending.append(key)
+            return True
+
+    def recent_ids(self) -> list:
+        """
+        Returns:
+            list: A copy of the most recently added ids.
+        """
+        with self.lock:
+            return list(self.recent)
+
+    def flush(self, keys: list = None) -> None:
+        """
+        Append the ids added since the last flush to path.
+        Call this once the corresponding posts have been written out.
+
+        Args:
+            keys: Only persist these pending ids, e.g. those of the rows one
+                scraper has just saved when the index is shared. Defaults to
+                every pending id.
+        """
+        with self.lock:
+            if keys is None:
+                ids, self.pending = self.pending, []
+            else:
+                keys = set(keys)
+                ids = [key for key in self.pending if key in keys]
+                self.pending = [key for key in self.pending if key not in keys]
+
+            if self.path and ids:
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.write("\n".join(ids) + "\n")
+                    file.flush()
+                    os.fsync(file.fileno())
@@ -0,0 +1,123 @@
+import time
+
+import requests
+from lxml import html as lxml_html
+from lxml.etree import ParserError
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Same headers EtsyScraper._add_custom_headers sets on browser requests
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br, zstd",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Dest": "document",
+}
+
+# The session can only decode what urllib3 supports here (br and zstd need
+# the brotli and zstandard packages), so it does not advertise the rest
+HTTP_HEADERS = {**HEADERS, "Accept-Encoding": ACCEPT_ENCODING.replace(",", ", ")}
+
+ABOUT_XPATH = "//span[contains(@data-endpoint, 'AboutPost')]"
+
+# Markers of the bot challenge pages Etsy serves instead of the shop
+BLOCK_MARKERS = ("captcha-delivery.com", "px-captcha", "Pardon Our Interruption")
+
+
+def parse_about(page):
+    """
+    Extracts the About text of a shop from its server-rendered HTML.
+
+    Parameters:
+        page (str or bytes): The HTML of a shop's About page.
+
+    Returns:
+        tuple: (status, text). status is "ok" when the About text was found,
+        "blocked" for a bot challenge page and "missing" otherwise.
+    """
+    if isinstance(page, bytes):
+        page = page.decode("utf-8", errors="replace")
+    if not page.strip():
+        return "missing", None
+    if any(marker in page for marker in BLOCK_MARKERS):
+        return "blocked", None
+
+    try:
+        tree = lxml_html.fromstring(page)
+    except ParserError:
+        return "missing", None
+    spans = tree.xpath(ABOUT_XPATH)
+    if not spans:
+        return "missing", None
+
+    # Keep line breaks like the browser's .text does
+    for br in spans[0].iter("br"):
+        br.tail = "\n" + (br.tail or "")
+    lines = (line.strip() for line in spans[0].text_content().splitlines())
+    text = "\n".join(line for line in lines if line)
+    return ("ok", text) if text else ("missing", None)
+
+
+class AboutFetcher:
+    """
+    Fetches shop About pages over plain HTTP, without a browser.
+
+    Requests share one pooled session sending the same headers as the browser,
+    except that only the encodings urllib3 can decode are accepted.
+    fetch() reports whether the page had the About text, so the caller can fall
+    back to Selenium when it is missing or the request was blocked.
+
+    Attributes:
+        timeout (float): Seconds to wait for each page.
+        session (requests.Session): The pooled session. Can be replaced, e.g. with
+            one that serves saved HTML fixtures.
+    """
+
+    def __init__(self, timeout=10, pool_size=16, session=None):
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.headers.update(HTTP_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def fetch(self, url, proxy=None, referer=None):
+        """
+        Fetches and parses one shop's About page.
+
+        Parameters:
+            url (str): The shop URL, as passed to EtsyScraper.
+            proxy (str): Optional proxy as host:port.
+            referer (str): Optional Referer header.
+
+        Returns:
+            tuple: (status, text, seconds). status is "ok", "missing", "blocked"
+            or "error".
+        """
+        proxies = (
+            {"http": f"http://{proxy}", "https": f"http://{proxy}"} if proxy else None
+        )
+        headers = {"Referer": referer} if referer else None
+
+        start = time.perf_counter()
+        try:
+            response = self.session.get(
+                url + "?ref=anchored_listing#about",
+                headers=headers,
+                proxies=proxies,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            print(f"HTTP error for {url}: {e}")
+            return "error", None, time.perf_counter() - start
+        seconds = time.perf_counter() - start
+
+        if response.status_code in (403, 429):
+            return "blocked", None, seconds
+        if response.status_code != 200:
+            return "missing", None, seconds
+
+        status, text = parse_about(response.content)
+        return status, text, seconds
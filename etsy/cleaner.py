@@ -1,4 +1,42 @@
-def clean_about_column(df):
+import hashlib
+import re
+
+import pandas as pd
+
+# Runs of dots collapse to one dot
+CLEAN_RE = re.compile(r"\.{2,}")
+
+
+def normalize_about(text):
+    """
+    Normalize one 'about' text in a single pass.
+
+    Drops characters that cannot be encoded as UTF-8, collapses consecutive dots,
+    empties texts that are just "//" and trims surrounding whitespace. Double
+    slashes inside a text (e.g. in URLs) are kept.
+
+    Parameters:
+        text (str): The raw 'about' text.
+
+    Returns:
+        str: The normalized text.
+    """
+    if not text.isascii():
+        text = text.encode("utf-8", errors="ignore").decode("utf-8")
+    text = CLEAN_RE.sub(".", text)
+    if text == "//":
+        return ""
+    return text.strip()
+
+
+def about_digest(text):
+    """Return a 64-bit digest of a text, used to detect duplicates without keeping it."""
+    return int.from_bytes(
+        hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def clean_about_column(df, seen=None):
     """
     Clean and normalize the 'about' column of a DataFrame.
 
@@ -6,41 +44,66 @@ def clean_about_column(df):
     the 'about' text:
 
     1. Replaces NaN values with an empty string.
-    2. Encodes/decodes the text using UTF-8 to handle special characters.
-    3. Removes consecutive dots, double slashes, and excess whitespace.
-    4. Trims leading/trailing whitespace from each cell.
-    5. Removes any rows where 'about' is empty after trimming.
-    6. Drops duplicate rows based on the cleaned 'about' text.
+    2. Normalizes each text in one pass (see normalize_about): drops characters
+       that are not valid UTF-8, removes consecutive dots, empties texts that are
+       just "//", and trims leading/trailing whitespace.
+    3. Removes any rows where 'about' is empty after trimming.
+    4. Drops duplicate rows based on a digest of the cleaned 'about' text.
 
     Parameters:
         df (pd.DataFrame): DataFrame containing the 'about' column to be cleaned.
+        seen (set): Digests of texts already kept. Pass the same set for every
+            chunk of a file to drop duplicates across chunks.
 
     Returns:
         pd.DataFrame: DataFrame with the 'about' column cleaned and normalized.
     """
+    seen = set() if seen is None else seen
 
-    # Replace NaN values with an empty string
-    df["about"].fillna("", inplace=True)
+    about = [normalize_about(str(text)) for text in df["about"].fillna("")]
+    df = df.assign(about=about)
 
-    # Normalize special characters using UTF-8 encoding/decoding
-    try:
-        df["about"] = (
-            df["about"].str.encode("utf-8", errors="ignore").str.decode("utf-8")
-        )
-    except UnicodeDecodeError:
-        pass  # Ignore any decoding errors
+    # Remove any rows where 'about' is empty after trimming
+    df = df[df["about"] != ""]
 
-    # Remove consecutive dots and double slashes
-    df["about"] = df["about"].replace(r"\.{2,}", ".", regex=True)
-    df["about"] = df["about"].replace("//", "", regex=False)
+    # Drop duplicate rows, keeping the first occurrence of each text
+    keep = [
+        not (digest in seen or seen.add(digest))
+        for digest in map(about_digest, df["about"])
+    ]
+    return df[keep]
 
-    # Trim whitespace from each cell
-    df["about"] = df["about"].str.strip()
 
-    # Remove any rows where 'about' is empty after trimming
-    df = df[df["about"].str.strip().notna()]
+def clean_about_csv(input_path, output_path, chunksize=100_000):
+    """
+    Clean a CSV of scraped 'about' texts chunk by chunk.
+
+    Only one chunk and one 64-bit digest per kept row are held in memory, so
+    corpora of millions of rows can be cleaned without loading them whole.
 
-    # Drop duplicate rows based on the cleaned 'about' text
-    df = df.drop_duplicates(subset="about", keep="first")
+    Parameters:
+        input_path (str): CSV with an 'about' column, e.g. from EtsyScraper.scrape.
+        output_path (str): Where the cleaned CSV is written.
+        chunksize (int): Rows processed at a time.
+
+    Returns:
+        int: The number of rows written.
+    """
+    seen = set()
+    written = 0
+
+    for index, chunk in enumerate(
+        pd.read_csv(input_path, encoding="utf-8", dtype=str, chunksize=chunksize)
+    ):
+        chunk = clean_about_column(chunk, seen)
+        chunk.to_csv(
+            output_path,
+            encoding="utf-8",
+            index=False,
+            mode="w" if index == 0 else "a",
+            header=index == 0,
+        )
+        written += len(chunk)
 
-    return df
+    print(f"Kept {written} unique 'about' texts")
+    return written
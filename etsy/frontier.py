@@ -0,0 +1,200 @@
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+
+
+class Frontier:
+    """
+    A persistent, SQLite-backed queue of shop URLs to scrape.
+
+    Every URL is in one of four states: pending, claimed, done or failed, and
+    counts how many times it was attempted. Workers claim URLs inside a write
+    transaction, so several scraper processes can share one frontier file
+    without scraping the same URL twice. A claim that is not finished or renewed
+    within `lease` seconds (e.g. its process crashed) becomes claimable again,
+    so a restarted run resumes where the last one stopped.
+
+    Attributes:
+        path (str): The SQLite database file.
+        lease (float): Seconds a claim is held before it can be taken over.
+        worker (str): Identifies this process in the claimed_by column.
+    """
+
+    def __init__(self, path="./frontier.db", lease=600, worker=None):
+        self.path = path
+        self.lease = lease
+        self.worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                claimed_by TEXT,
+                claimed_at REAL,
+                error TEXT,
+                updated REAL
+            )
+            """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS urls_state ON urls (state)")
+
+    @contextmanager
+    def _transaction(self):
+        """Runs a block of writes as one transaction, holding the write lock throughout."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def add(self, urls):
+        """
+        Adds URLs as pending. URLs already in the frontier keep their state.
+
+        Returns:
+            int: The number of new URLs.
+        """
+        before = self.conn.total_changes
+        with self._transaction():
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, updated) VALUES (?, ?)",
+                ((url, time.time()) for url in urls),
+            )
+        return self.conn.total_changes - before
+
+    def claim(self, n=10):
+        """
+        Claims up to n pending URLs (or URLs whose claim has expired) for this worker.
+
+        Returns:
+            list: The claimed URLs. Empty once nothing is left to claim.
+        """
+        now = time.time()
+        with self._transaction():
+            urls = [
+                row[0]
+                for row in self.conn.execute(
+                    """
+                    SELECT url FROM urls
+                    WHERE state = 'pending'
+                       OR (state = 'claimed' AND claimed_at < ?)
+                    LIMIT ?
+                    """,
+                    (now - self.lease, n),
+                )
+            ]
+            self.conn.executemany(
+                """
+                UPDATE urls
+                SET state = 'claimed', attempts = attempts + 1,
+                    claimed_by = ?, claimed_at = ?, updated = ?
+                WHERE url = ?
+                """,
+                ((self.worker, now, now, url) for url in urls),
+            )
+        return urls
+
+    def __iter__(self):
+        """
+        Claims and yields URLs one at a time until none are left.
+
+        A single browser scrape can take minutes, so URLs are not claimed ahead
+        of being worked on, where their lease could run out while they wait.
+        """
+        while True:
+            urls = self.claim(1)
+            if not urls:
+                return
+            yield from urls
+
+    def renew(self, urls):
+        """Restarts the lease of URLs this worker has claimed and is still working on."""
+        now = time.time()
+        with self._transaction():
+            self.conn.executemany(
+                """
+                UPDATE urls SET claimed_at = ?, updated = ?
+                WHERE url = ? AND state = 'claimed' AND claimed_by = ?
+                """,
+                ((now, now, url, self.worker) for url in urls),
+            )
+
+    def done(self, urls):
+        """
+        Marks URLs this worker still holds as scraped.
+
+        Returns:
+            int: The number of URLs marked.
+        """
+        return self._set_state(urls, "done")
+
+    def fail(self, url, error=None):
+        """
+        Marks a URL this worker still holds as failed, keeping the error for later
+        inspection.
+
+        Returns:
+            int: 1 if the URL was marked, 0 otherwise.
+        """
+        return self._set_state([url], "failed", error)
+
+    def _set_state(self, urls, state, error=None):
+        # Only claims that are still ours: once a lease expired and another
+        # worker took a URL over, its outcome is that worker's to record
+        urls = list(urls)
+        now = time.time()
+        before = self.conn.total_changes
+        with self._transaction():
+            self.conn.executemany(
+                """
+                UPDATE urls SET state = ?, error = ?, claimed_by = NULL, updated = ?
+                WHERE url = ? AND state = 'claimed' AND claimed_by = ?
+                """,
+                ((state, error, now, url, self.worker) for url in urls),
+            )
+        changed = self.conn.total_changes - before
+        if changed < len(urls):
+            print(
+                f"Frontier: {len(urls) - changed} of {len(urls)} URLs were no longer "
+                f"claimed by {self.worker}, not marked {state}"
+            )
+        return changed
+
+    def retry_failed(self, max_attempts=None):
+        """
+        Puts failed URLs back into the pending state.
+
+        Parameters:
+            max_attempts (int): Only retry URLs attempted fewer times than this.
+
+        Returns:
+            int: The number of URLs requeued.
+        """
+        query = "UPDATE urls SET state = 'pending', updated = ? WHERE state = 'failed'"
+        params = [time.time()]
+        if max_attempts is not None:
+            query += " AND attempts < ?"
+            params.append(max_attempts)
+        with self._transaction():
+            return self.conn.execute(query, params).rowcount
+
+    def counts(self):
+        """
+        Returns:
+            dict: The number of URLs in each state.
+        """
+        counts = {"pending": 0, "claimed": 0, "done": 0, "failed": 0}
+        for state, count in self.conn.execute(
+            "SELECT state, COUNT(*) FROM urls GROUP BY state"
+        ):
+            counts[state] = count
+        return counts
+
+    def close(self):
+        self.conn.close()
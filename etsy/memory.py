@@ -0,0 +1,109 @@
+import os
+import time
+
+try:
+    import psutil
+except ImportError:  # fall back to /proc on Linux
+    psutil = None
+
+
+def _proc_children(pid):
+    children = []
+    task_dir = f"/proc/{pid}/task"
+    for tid in os.listdir(task_dir):
+        try:
+            with open(f"{task_dir}/{tid}/children", "r") as f:
+                children.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+    return children
+
+
+def _proc_rss(pid):
+    with open(f"/proc/{pid}/statm", "r") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_bytes(pid=None, children=True):
+    """
+    Returns the resident memory of a process and, optionally, all its descendants.
+
+    With children=True this covers the scraper itself (including selenium-wire's
+    in-process proxy), chromedriver and every Chrome process.
+
+    Parameters:
+        pid (int): The process. Defaults to the current one.
+        children (bool): Include every descendant process.
+
+    Returns:
+        int: Resident set size in bytes, or 0 if it cannot be measured.
+    """
+    pid = pid or os.getpid()
+
+    if psutil is not None:
+        process = psutil.Process(pid)
+        processes = [process] + (process.children(recursive=True) if children else [])
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    if not os.path.exists("/proc"):
+        return 0
+
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            total += _proc_rss(current)
+            if children:
+                pending.extend(_proc_children(current))
+        except OSError:
+            pass
+    return total
+
+
+class MemoryProfile:
+    """
+    Samples the RSS of the scraper and its browser while it runs.
+
+    Attributes:
+        watermark (int): RSS in bytes above which the driver should be recycled,
+            or None for no limit.
+        samples (list): (pages, seconds since start, rss bytes) per sample.
+        purges (int): Times the captured requests were purged.
+        recycles (int): Times the driver was restarted.
+    """
+
+    def __init__(self, watermark_mb=None):
+        self.watermark = watermark_mb * 2**20 if watermark_mb else None
+        self.start = time.monotonic()
+        self.samples = []
+        self.purges = 0
+        self.recycles = 0
+
+    def sample(self, pages):
+        """
+        Records the current RSS.
+
+        Returns:
+            bool: True if the RSS is above the watermark.
+        """
+        rss = rss_bytes()
+        self.samples.append((pages, round(time.monotonic() - self.start, 1), rss))
+        return self.watermark is not None and rss > self.watermark
+
+    def report(self):
+        """Prints the start, peak and last RSS along with the purges and recycles."""
+        if not self.samples:
+            return
+        mb = [rss / 2**20 for _, _, rss in self.samples]
+        print(
+            f"memory: {mb[0]:.0f} MB at start, {max(mb):.0f} MB peak, "
+            f"{mb[-1]:.0f} MB after {self.samples[-1][0]} pages "
+            f"({self.purges} purges, {self.recycles} driver recycles)"
+        )
@@ -0,0 +1,220 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+class ProxyChecker:
+    """
+    Checks many proxies concurrently and ranks the working ones by latency.
+
+    Results are cached in a JSON file for `ttl` seconds, per test_url, so
+    repeated runs only probe proxies whose last check against the same URL and
+    with the same timeout has expired.
+
+    Attributes:
+        test_url (str): URL fetched through each proxy. Point it at a local
+            endpoint to test without reaching the internet.
+        timeout (float): Seconds to wait for each proxy.
+        workers (int): Maximum number of proxies probed at the same time.
+        cache_path (str): JSON file the results are cached in, or None to disable caching.
+        ttl (float): Seconds a cached result stays valid.
+        results (dict): proxy -> {"ok": bool, "latency": float or None,
+            "checked": timestamp, "timeout": float} for test_url.
+    """
+
+    TEST_URL = "https://httpbin.org/ip"
+
+    def __init__(
+        self,
+        test_url=None,
+        timeout=2,
+        workers=64,
+        cache_path="./proxy_cache.json",
+        ttl=600,
+    ):
+        self.test_url = test_url or self.TEST_URL
+        self.timeout = timeout
+        self.workers = workers
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.cache = {}
+        self.lock = threading.Lock()
+
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, "r", encoding="utf-8") as f:
+                self.cache = json.load(f)
+        # test_url -> proxy -> result, so a check against one URL is never
+        # reused for another
+        self.results = self.cache.setdefault(self.test_url, {})
+
+    def check(self, proxy):
+        """
+        Probes a single proxy.
+
+        Parameters:
+            proxy (str): The proxy as host:port.
+
+        Returns:
+            float: The round trip time in seconds, or None if the proxy failed.
+        """
+        proxies = {
+            "http": f"http://{proxy}",
+            "https": f"http://{proxy}",
+        }
+        start = time.perf_counter()
+        try:
+            response = requests.get(
+                self.test_url, proxies=proxies, timeout=self.timeout
+            )
+            latency = (
+                time.perf_counter() - start if response.status_code == 200 else None
+            )
+        except requests.RequestException:
+            latency = None
+
+        with self.lock:
+            self.results[proxy] = {
+                "ok": latency is not None,
+                "latency": latency,
+                "checked": time.time(),
+                "timeout": self.timeout,
+            }
+        return latency
+
+    def _is_fresh(self, proxy):
+        result = self.results.get(proxy)
+        return (
+            result is not None
+            and result.get("timeout") == self.timeout
+            and time.time() - result["checked"] < self.ttl
+        )
+
+    def rank(self, proxies):
+        """
+        Checks every proxy whose cached result has expired and ranks the working ones.
+
+        Parameters:
+            proxies (list): Proxies as host:port.
+
+        Returns:
+            list: The working proxies, fastest first.
+        """
+        unique = list(dict.fromkeys(proxies))
+        stale = [proxy for proxy in unique if not self._is_fresh(proxy)]
+        print(f"Checking {len(stale)} proxies ({len(unique) - len(stale)} cached)")
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(self.check, stale))
+            self.save()
+
+        working = [proxy for proxy in unique if self.results.get(proxy, {}).get("ok")]
+        return sorted(working, key=lambda proxy: self.results[proxy]["latency"])
+
+    def save(self):
+        """Writes the results to the cache file."""
+        if not self.cache_path:
+            return
+        with self.lock:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(self.cache, f)
+
+
+class ProxyScheduler:
+    """
+    Assigns proxies to requests based on their recent success rate and latency.
+
+    Each acquire() picks one of the available proxies at random, weighted by its
+    score, so load is spread over the whole pool while faster and more reliable
+    proxies get more of it. A proxy that fails (blocked, timed out) is taken out
+    of rotation for a cooldown period that doubles with each consecutive failure.
+
+    Attributes:
+        cooldown (float): Base cooldown in seconds after a failure.
+        stats (dict): proxy -> recent results, smoothed latency, consecutive
+            failures and the time its cooldown ends.
+    """
+
+    def __init__(self, proxies, latencies=None, cooldown=120, window=20):
+        """
+        Parameters:
+            proxies (list): Proxies as host:port.
+            latencies (dict): Optional initial latency per proxy, e.g. from ProxyChecker.
+            cooldown (float): Base cooldown in seconds after a failure.
+            window (int): Number of recent results the success rate is computed over.
+        """
+        latencies = latencies or {}
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.stats = {
+            proxy: {
+                "results": deque(maxlen=window),
+                "latency": latencies.get(proxy),
+                "failures": 0,
+                "cooldown_until": 0.0,
+            }
+            for proxy in proxies
+        }
+
+    def score(self, proxy):
+        """
+        Scores a proxy as its smoothed success rate divided by its latency.
+
+        Returns:
+            float: Higher is better.
+        """
+        stats = self.stats[proxy]
+        results = stats["results"]
+        success_rate = (sum(results) + 1) / (len(results) + 2)
+        return success_rate / max(stats["latency"] or 1.0, 0.05)
+
+    def acquire(self):
+        """
+        Picks a proxy for the next request.
+
+        Returns:
+            str: A proxy that is not cooling down, or None if all of them are.
+        """
+        now = time.time()
+        with self.lock:
+            available = [
+                proxy
+                for proxy, stats in self.stats.items()
+                if stats["cooldown_until"] <= now
+            ]
+            if not available:
+                return None
+            weights = [self.score(proxy) for proxy in available]
+            return random.choices(available, weights=weights)[0]
+
+    def report(self, proxy, ok, latency=None):
+        """
+        Records the outcome of a request made through a proxy.
+
+        Parameters:
+            proxy (str): The proxy used.
+            ok (bool): Whether the request succeeded.
+            latency (float): Seconds the request took, if it succeeded.
+        """
+        with self.lock:
+            stats = self.stats[proxy]
+            stats["results"].append(1 if ok else 0)
+
+            if ok:
+                stats["failures"] = 0
+                if latency is not None:
+                    previous = stats["latency"]
+                    stats["latency"] = (
+                        latency if previous is None else 0.7 * previous + 0.3 * latency
+                    )
+            else:
+                stats["failures"] += 1
+                stats["cooldown_until"] = time.time() + self.cooldown * 2 ** (
+                    stats["failures"] - 1
+                )
@@ -1,8 +1,6 @@
-import os
 import time
 import random
-import pandas as pd
-import requests
+from functools import partial
 
 # from selenium import webdriver
 from selenium.webdriver import Keys
@@ -11,6 +9,16 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from seleniumwire import webdriver
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+from about import ABOUT_XPATH, BLOCK_MARKERS, HEADERS, AboutFetcher
+from memory import MemoryProfile
+from proxies import ProxyChecker, ProxyScheduler
+from sink import RowSink
+
+# Only the shop page itself is captured by selenium-wire. Everything else
+# (scripts, images, API calls) is streamed through without being stored.
+CAPTURE_SCOPE = r"^https?://(www\.)?etsy\.com/shop/"
 
 rand = [0.5, 0.6, 0.7, 0.8, 0.9, 1, 1.1, 1.2, 1.3, 1.4, 1.5]
 
@@ -24,48 +32,152 @@ class EtsyScraper:
         headers (dict): Custom headers for browser simulation, including user agent and referer.
     """
 
-    def __init__(self, urls, proxy_list=[]):
+    def __init__(
+        self,
+        urls,
+        proxy_list=[],
+        proxy_cooldown=120,
+        lean=None,
+        capture_max_requests=20,
+        capture_max_bytes=16 * 2**20,
+        purge_every=50,
+        rss_watermark_mb=None,
+    ):
+        """
+        Parameters:
+            urls (list): Shop URLs to scrape.
+            proxy_list (list): Proxies as host:port to rotate through.
+            proxy_cooldown (float): Base cooldown in seconds of a failed proxy.
+            lean (LeanBrowser): Optional lean profile: run Chrome headless and block
+                images, media, fonts and trackers, measuring requests and bytes per shop.
+            capture_max_requests (int): Captured requests selenium-wire keeps in
+                memory; older ones are dropped as new ones arrive.
+            capture_max_bytes (int): Captured body bytes above which the captured
+                requests are purged.
+            purge_every (int): Purge the captured requests every this many pages.
+            rss_watermark_mb (float): Restart the browser when the RSS of the
+                scraper and its browser processes exceeds this many MB.
+        """
         self.urls = urls
         self.options = Options()
         self.options.add_argument("--enable-javascript")
         self.options.add_argument("--start-maximized")
         self.options.add_argument("--disable-blink-features=AutomationControlled")
         self.options.add_argument("--incognito")  # Simulate incognito mode
-        self.driver = webdriver.Chrome(options=self.options, seleniumwire_options={})
+        self.lean = lean
+        if lean:
+            lean.chrome_options(self.options)
 
-        # Add default headers to all requests
-        self.driver.request_interceptor = self._add_custom_headers
+        self.seleniumwire_options = {
+            "request_storage": "memory",
+            "request_storage_max_size": capture_max_requests,
+        }
+        self.capture_max_bytes = capture_max_bytes
+        self.purge_every = purge_every
+        self.memory = MemoryProfile(rss_watermark_mb)
+        self.pages = 0
+        self._start_driver()
 
         self.proxy_list = proxy_list
+        self.proxy_cooldown = proxy_cooldown
+        self.proxy_scheduler = (
+            ProxyScheduler(proxy_list, cooldown=proxy_cooldown) if proxy_list else None
+        )
+        self.current_proxy = None
+
+        self.about_fetcher = AboutFetcher()
+        self.mode_stats = {
+            mode: {"tried": 0, "hits": 0, "seconds": 0.0}
+            for mode in ("http", "browser")
+        }
 
         self.data = []
         self.posts = []
         self.postsId = set()
         self.prev_url = "https://www.etsy.com"
 
-    def filter_working_proxies(self):
-        """Filters the working proxies from a given list."""
-        working_proxies = []
-        count = 0
-        for proxy in self.proxy_list:
-            if self.is_proxy_working(proxy):
-                working_proxies.append(proxy)
-                count += 1
-                print(count)
+    def _start_driver(self):
+        """Starts Chrome with capture limited to the shop pages."""
+        self.driver = webdriver.Chrome(
+            options=self.options, seleniumwire_options=self.seleniumwire_options
+        )
+        self.driver.scopes = [CAPTURE_SCOPE]
+        if self.lean:
+            # Blocked requests never reach selenium-wire or the upstream proxy
+            self.lean.attach(self.driver)
+
+        # Add default headers to the captured (shop page) requests
+        self.driver.request_interceptor = self._add_custom_headers
+
+    def _recycle_driver(self):
+        """Restarts the browser, releasing everything it and selenium-wire hold."""
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Error closing driver: {e}")
+        self._start_driver()
+        self.memory.recycles += 1
+
+    def _after_page(self):
+        """
+        Keeps memory bounded after every browser page: purges the captured requests
+        periodically or when their bodies exceed capture_max_bytes, and restarts
+        the browser when the RSS goes over the watermark.
+        """
+        self.pages += 1
+
+        captured = sum(
+            len(request.response.body)
+            for request in self.driver.requests
+            if request.response
+        )
+        if self.pages % self.purge_every == 0 or captured > self.capture_max_bytes:
+            del self.driver.requests
+            self.memory.purges += 1
+
+        if self.memory.sample(self.pages):
+            print(f"RSS above watermark after {self.pages} pages, restarting browser")
+            self._recycle_driver()
+
+    def filter_working_proxies(self, workers=64, ttl=600, test_url=None):
+        """
+        Filters the working proxies from a given list.
+
+        Proxies are probed concurrently and results are cached for ttl seconds
+        (see ProxyChecker), so repeated runs only re-check expired entries.
+
+        Parameters:
+            workers (int): Maximum number of proxies probed at the same time.
+            ttl (float): Seconds a cached check result stays valid.
+            test_url (str): URL to fetch through each proxy. Defaults to httpbin.
+
+        The proxy scheduler is rebuilt from the working proxies, seeded with
+        their measured latencies.
+
+        Returns:
+            list: The working proxies, fastest first.
+        """
+        self.proxy_checker = ProxyChecker(test_url=test_url, workers=workers, ttl=ttl)
+        working_proxies = self.proxy_checker.rank(self.proxy_list)
+        print(f"{len(working_proxies)} of {len(self.proxy_list)} proxies working")
+
+        if working_proxies:
+            self.proxy_scheduler = ProxyScheduler(
+                working_proxies,
+                latencies={
+                    proxy: self.proxy_checker.results[proxy]["latency"]
+                    for proxy in working_proxies
+                },
+                cooldown=self.proxy_cooldown,
+            )
 
         return working_proxies
 
     def is_proxy_working(self, proxy):
         """Checks if a proxy is working."""
-        test_url = "https://httpbin.org/ip"
-
-        proxies = {
-            "http": f"http://{proxy}",
-            "https": f"http://{proxy}",
-        }
-        response = requests.get(test_url, proxies=proxies, timeout=2)
-        if response.status_code == 200:
-            print(f"Proxy {proxy} is working: {response.json()}")
+        latency = ProxyChecker(cache_path=None).check(proxy)
+        if latency is not None:
+            print(f"Proxy {proxy} is working: {latency:.2f}s")
             return True
         return False
 
@@ -77,62 +189,230 @@ class EtsyScraper:
         del request.headers["Accept-Encoding"]
         del request.headers["Cookie"]
 
-        request.headers["User-Agent"] = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
-        )
-        request.headers["Accept"] = (
-            "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
-        )
-        request.headers["Accept-Language"] = "en-US,en;q=0.5"
-        request.headers["Accept-Encoding"] = "gzip, deflate, br, zstd"
-
-        request.headers["Sec-Fetch-Mode"] = "navigate"
-        request.headers["Sec-Fetch-Dest"] = "document"
+        for name, value in HEADERS.items():
+            request.headers[name] = value
 
     def _initialize_driver(self, referer):
         """
         Initializes the Selenium WebDriver with the rotating proxy endpoint.
+
+        When a proxy list was given, the next proxy is taken from the scheduler and
+        set as selenium-wire's upstream proxy. If every proxy is cooling down, this
+        waits until one becomes available again.
         """
         self.referer = referer
         self.driver.request_interceptor = self._add_custom_headers
 
-    def scrape(self, output_path="./temp.csv"):
-        for url in self.urls:
+        if self.proxy_scheduler is None:
+            return
+
+        proxy = self.proxy_scheduler.acquire()
+        if proxy is None:
+            print("All proxies are cooling down, waiting...")
+        while proxy is None:
+            time.sleep(1)
+            proxy = self.proxy_scheduler.acquire()
+
+        self.current_proxy = proxy
+        self.driver.proxy = {
+            "http": f"http://{proxy}",
+            "https": f"http://{proxy}",
+            "no_proxy": "localhost,127.0.0.1",
+        }
+
+    def scrape(
+        self,
+        output_path="./temp.csv",
+        retries=2,
+        output_format=None,
+        fetch_mode="auto",
+        frontier=None,
+    ):
+        """
+        Scrapes the About text of every shop and appends it to output_path.
+
+        Rows go through a RowSink, which keeps the output open for the whole run,
+        writes rows in batches and fsyncs at regular checkpoints.
+
+        Parameters:
+            output_path (str): File the rows are appended to.
+            retries (int): When proxies are used, how many more times a URL is tried
+                on a different proxy after a block or timeout.
+            output_format (str): "csv", "jsonl" or "parquet". Defaults to the
+                extension of output_path.
+            fetch_mode (str): "auto" tries a plain HTTP request first and only opens
+                the page in the browser when the About text is missing or the
+                request was blocked. "http" and "browser" use only one of them.
+            frontier (Frontier): Optional persistent frontier. self.urls are added
+                to it, and URLs are then claimed from it instead of iterated, so an
+                interrupted run can be resumed and several processes can share it.
+                A URL is only marked done once a sink checkpoint has made its row
+                durable.
+        """
+        with RowSink(output_path, ["url", "about"], fmt=output_format) as sink:
+            self._scrape_urls(sink, retries, fetch_mode, frontier)
+        self.print_mode_stats()
+        if frontier is not None:
+            print(f"Frontier: {frontier.counts()}")
+
+    def _scrape_urls(self, sink, retries, fetch_mode="auto", frontier=None):
+        """Scrapes every URL in self.urls (or claimed from frontier) into sink."""
+        if frontier is not None:
+            frontier.add(self.urls)
+        urls = self.urls if frontier is None else frontier
+
+        pending = []  # URLs whose rows are written but not yet durable
+        durable = sink.rows_durable
+        renew = None
+        try:
+            for url in urls:
+                if frontier is not None:
+                    # Keep the claims alive while this URL is scraped
+                    renew = partial(frontier.renew, pending + [url])
+                    renew()
+
+                data = None
+                if fetch_mode in ("auto", "http"):
+                    data = self._scrape_http(url)
+                if data is None and fetch_mode in ("auto", "browser"):
+                    data = self._scrape_browser(url, retries, renew)
+
+                if data is None:
+                    if frontier is not None:
+                        frontier.fail(url, "About text not found")
+                    continue
+
+                sink.write({"url": url, "about": data})
+                if frontier is not None:
+                    pending.append(url)
+                    # Rows reach the sink in order, so the first ones are durable
+                    count = sink.rows_durable - durable
+                    if count:
+                        frontier.done(pending[:count])
+                        pending = pending[count:]
+                        durable = sink.rows_durable
+        finally:
+            if pending:
+                sink.flush()
+                sink.checkpoint()
+                frontier.done(pending)
+
+    def _record(self, mode, hit, seconds):
+        stats = self.mode_stats[mode]
+        stats["tried"] += 1
+        stats["hits"] += int(hit)
+        stats["seconds"] += seconds
+
+    def _scrape_http(self, url):
+        """
+        Fetches the About text of one shop without the browser.
+
+        Returns:
+            str: The About text, or None if it was missing or the request was blocked.
+        """
+        proxy = self.proxy_scheduler.acquire() if self.proxy_scheduler else None
+        status, data, seconds = self.about_fetcher.fetch(
+            url, proxy=proxy, referer=self.prev_url
+        )
+        self._record("http", status == "ok", seconds)
+
+        if proxy:
+            if status == "ok":
+                self.proxy_scheduler.report(proxy, True, seconds)
+            elif status in ("blocked", "error"):
+                self.proxy_scheduler.report(proxy, False)
+
+        if status != "ok":
+            print(f"HTTP fetch {status} for {url}")
+        return data
+
+    def _scrape_browser(self, url, retries, renew=None):
+        """
+        Opens one shop in the browser and reads its About text.
+
+        Parameters:
+            renew (callable): Called before every attempt to renew frontier claims.
+
+        Only load failures, timeouts and block pages are retried on another proxy.
+        A page that loads without the About text is reported as missing at once.
+
+        Returns:
+            str: The About text, or None if it is missing or every attempt failed.
+        """
+        attempts = retries + 1 if self.proxy_scheduler else 1
+
+        for _ in range(attempts):
+            # Reinitialize driver for each request
+            self._initialize_driver(url)
+            if renew is not None:
+                renew()
+            start = time.perf_counter()
             try:
-                # Reinitialize driver for each request
-                self._initialize_driver(url)
                 self.driver.get(url + "?ref=anchored_listing#about")
+            except Exception as e:
+                # The proxy failed or the page timed out: cool it down and rotate
+                print(f"Error loading {url}: {e}")
+                self._browser_failed(start)
+                continue
+
+            load_time = time.perf_counter() - start
+            if self.lean:
+                self.lean.record(self.driver, page=url)
 
-                t = random.uniform(5, 6)  # Random delay
-                print(f"Sleeping for {t} seconds")
-                time.sleep(t)
+            t = random.uniform(5, 6)  # Random delay
+            print(f"Sleeping for {t} seconds")
+            time.sleep(t)
 
-                # Fetch the data
+            # Fetch the data
+            try:
                 data = (
                     WebDriverWait(self.driver, 5)
-                    .until(
-                        EC.presence_of_element_located(
-                            (By.XPATH, "//span[contains(@data-endpoint, 'AboutPost')]")
-                        )
-                    )
+                    .until(EC.presence_of_element_located((By.XPATH, ABOUT_XPATH)))
                     .text
                 )
+            except TimeoutException:
+                if any(marker in self.driver.page_source for marker in BLOCK_MARKERS):
+                    print(f"Blocked on {url}")
+                    self._browser_failed(start)
+                    continue
 
-                # Create a single-row DataFrame with the new entry
-                new_data = pd.DataFrame({"url": [url], "about": [data]})
+                # The page loaded fine, the shop just has no About text
+                print(f"No About text for {url}")
+                self._record("browser", False, time.perf_counter() - start)
+                self._after_page()
+                if self.proxy_scheduler:
+                    self.proxy_scheduler.report(self.current_proxy, True, load_time)
+                return None
 
-                # Append the new entry directly to the CSV
-                new_data.to_csv(
-                    output_path,
-                    mode="a",
-                    header=not os.path.exists(output_path),
-                    index=False,
-                )
+            self._record("browser", True, time.perf_counter() - start)
+            self._after_page()
+            if self.proxy_scheduler:
+                self.proxy_scheduler.report(self.current_proxy, True, load_time)
 
-            except Exception as e:
-                print(f"Error: {e}")
+            return data
+
+        return None
 
-        return
+    def _browser_failed(self, start):
+        """Records a failed browser attempt and cools its proxy down."""
+        self._record("browser", False, time.perf_counter() - start)
+        if self.proxy_scheduler:
+            self.proxy_scheduler.report(self.current_proxy, False)
+        self._after_page()
+
+    def print_mode_stats(self):
+        """Prints the hit rate and mean latency of each fetch mode."""
+        if self.lean:
+            self.lean.report()
+        self.memory.report()
+        for mode, stats in self.mode_stats.items():
+            if not stats["tried"]:
+                continue
+            print(
+                f"{mode}: {stats['hits']}/{stats['tried']} hits "
+                f"({stats['hits'] / stats['tried']:.0%}), "
+                f"{stats['seconds'] / stats['tried']:.2f}s mean"
+            )
 
     def logIn(self, passr, usr):
         try:
@@ -0,0 +1,166 @@
+import csv
+import json
+import os
+import time
+
+
+def _fsync_path(path):
+    """Fsyncs a closed file, or a directory so the entries in it are durable."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class RowSink:
+    """
+    A buffered writer that keeps one output open for a whole scrape.
+
+    Rows are buffered in memory and written out every `batch_size` rows or every
+    `flush_interval` seconds, whichever comes first. Every `checkpoint_every`
+    rows (and on close) the output is fsynced, so rows flushed before a
+    checkpoint survive a crash of the scraper or the machine. rows_durable
+    tells how many rows that covers.
+
+    Supported formats, picked from the file extension unless given:
+        csv: Appends to the file; the header is only written to a new file.
+        jsonl: Appends one JSON object per line.
+        parquet: `path` is a directory of part files. Each flush adds a row group
+            to the current part, and each checkpoint closes it and fsyncs it and
+            the directory. A part has no footer until it is closed, so flushed
+            rows are not crash-safe before the next checkpoint; checkpoints
+            default to every 200 rows instead of 1000. Requires pyarrow.
+
+    Attributes:
+        path (str): Output file (or directory for parquet).
+        fields (list): Column names, in output order.
+        fmt (str): "csv", "jsonl" or "parquet".
+        rows_written (int): Rows flushed so far.
+        rows_durable (int): Rows made durable by the last checkpoint.
+    """
+
+    def __init__(
+        self,
+        path,
+        fields,
+        fmt=None,
+        batch_size=100,
+        flush_interval=10.0,
+        checkpoint_every=None,
+    ):
+        self.path = path
+        self.fields = list(fields)
+        self.fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower() or "csv"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        if checkpoint_every is None:
+            checkpoint_every = 200 if self.fmt == "parquet" else 1000
+        self.checkpoint_every = checkpoint_every
+
+        self.buffer = []
+        self.rows_written = 0
+        self.last_flush = time.monotonic()
+        self.rows_durable = 0
+
+        self.file = None
+        self.writer = None
+        self.part = 0
+
+        if self.fmt == "csv":
+            self.file = open(path, "a", encoding="utf-8", newline="")
+            self.writer = csv.DictWriter(self.file, fieldnames=self.fields)
+            if self.file.tell() == 0:
+                self.writer.writeheader()
+        elif self.fmt == "jsonl":
+            self.file = open(path, "a", encoding="utf-8")
+        elif self.fmt == "parquet":
+            import pyarrow as pa  # optional dependency, only needed for parquet
+
+            self.schema = pa.schema([(field, pa.string()) for field in self.fields])
+            os.makedirs(path, exist_ok=True)
+            self.part = len([f for f in os.listdir(path) if f.endswith(".parquet")])
+        else:
+            raise ValueError(f"Unsupported output format: {self.fmt}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, row):
+        """
+        Buffers one row, flushing when the batch is full or the interval has passed.
+
+        Parameters:
+            row (dict): Values keyed by field name. Missing fields are left empty.
+        """
+        self.buffer.append(row)
+        if (
+            len(self.buffer) >= self.batch_size
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered rows out, and checkpoints if enough rows have accumulated."""
+        if self.buffer:
+            if self.fmt == "csv":
+                self.writer.writerows(self.buffer)
+                self.file.flush()
+            elif self.fmt == "jsonl":
+                self.file.write(
+                    "".join(
+                        json.dumps(row, ensure_ascii=False) + "\n"
+                        for row in self.buffer
+                    )
+                )
+                self.file.flush()
+            else:
+                self._write_row_group(self.buffer)
+
+            self.rows_written += len(self.buffer)
+            self.buffer = []
+
+        self.last_flush = time.monotonic()
+        if self.rows_written - self.rows_durable >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Makes every row flushed so far durable on disk."""
+        if self.fmt == "parquet":
+            if self.writer is not None:
+                self.writer.close()
+                self.writer = None
+                _fsync_path(self._part_path())
+                _fsync_path(self.path)
+                self.part += 1
+        else:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        self.rows_durable = self.rows_written
+
+    def close(self):
+        """Flushes the remaining rows, checkpoints and closes the output."""
+        self.flush()
+        self.checkpoint()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _part_path(self):
+        return os.path.join(self.path, f"part-{self.part:05d}.parquet")
+
+    def _write_row_group(self, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self._part_path(), self.schema)
+
+        columns = {
+            field: [None if row.get(field) is None else str(row[field]) for row in rows]
+            for field in self.fields
+        }
+        self.writer.write_table(pa.table(columns, schema=self.schema))
@@ -7,6 +7,108 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
 
+# Serializes a batch of post cards in a single browser round trip. Uses the
+# same XPath/CSS selectors as the per-field fallback path in Post below.
+EXTRACT_POSTS_JS = """
+const cards = arguments[0];
+const exclude = new Set(arguments[1] || []);
+
+function one(node, xpath) {
+    return document.evaluate(
+        xpath, node, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+}
+
+function all(node, xpath) {
+    const res = document.evaluate(
+        xpath, node, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    const out = [];
+    for (let i = 0; i < res.snapshotLength; i++) {
+        out.push(res.snapshotItem(i));
+    }
+    return out;
+}
+
+function text(el) {
+    return el ? el.innerText.trim() : null;
+}
+
+return cards.map((card) => {
+    const post = one(card, ".//shreddit-post");
+    const postId = post ? post.getAttribute("id") : null;
+    if (postId !== null && exclude.has(postId)) {
+        return {postId: postId, skipped: true};
+    }
+
+    const user = one(
+        card,
+        './/a[contains(@href, "/user/")]//span[contains(@class, "whitespace-nowrap")]'
+    );
+    const title = one(card, './/a[@slot="title"]');
+    const paragraphs = all(card, './/div[@data-post-click-location="text-body"]//p');
+    const link = one(card, './/a[@target="_blank"]');
+    const time = one(card, ".//time");
+
+    let voteCount = null;
+    let commentCount = null;
+    if (post && post.shadowRoot) {
+        voteCount = text(post.shadowRoot.querySelector(
+            'span[data-post-click-location="vote"] faceplate-number'
+        ));
+        commentCount = text(post.shadowRoot.querySelector(
+            'a[data-post-click-location="comments-button"] faceplate-number'
+        ));
+    }
+
+    return {
+        postId: postId,
+        user: text(user),
+        title: text(title),
+        paragraphs: paragraphs.map((p) => p.innerText.trim()),
+        link: text(link),
+        voteCount: voteCount,
+        commentCount: commentCount,
+        timestamp: time ? time.getAttribute("datetime") : null,
+    };
+});
+"""
+
+
+def extract_posts(driver: WebDriver, cards: list, exclude=()) -> list:
+    """Serialize a batch of post cards with one injected script.
+
+    Args:
+        driver: The Selenium WebDriver the cards belong to.
+        cards: The DOM elements representing the Reddit posts.
+        exclude: (Optional) Post ids that are already known. Their cards are
+            returned as ``{"postId": ..., "skipped": True}`` without extracting
+            any other field.
+
+    Returns:
+        A list of plain dicts, one per card and in the same order, ready to be
+        passed to Post as ``payload``.
+    """
+    if not cards:
+        return []
+    return driver.execute_script(EXTRACT_POSTS_JS, cards, list(exclude))
+
+
+def post_id(card: WebElement) -> str:
+    """Read the shreddit post id of a card with a single lookup.
+
+    Args:
+        card: The DOM element representing the Reddit post.
+
+    Returns:
+        The post id, or None if the card does not hold a shreddit-post.
+    """
+    try:
+        return card.find_element("xpath", ".//shreddit-post").get_attribute("id")
+    except NoSuchElementException:
+        return None
+
+
 class Post:
     """A class to represent a Reddit post captured from Selenium.
 
@@ -14,6 +116,10 @@ class Post:
     post-related elements on a subreddit page. It provides properties and methods
     to access and process the captured data about the post.
 
+    Posts can be built either from a payload produced by extract_posts (one
+    browser round trip for a whole batch of cards) or, as a fallback, by
+    querying the card field by field.
+
     Attributes:
         card: The DOM element representing the Reddit post.
         driver: The Selenium WebDriver instance used to interact with the webpage.
@@ -25,8 +131,9 @@ class Post:
 
     def __init__(
         self,
-        card: WebElement,
-        driver: WebDriver,
+        card: WebElement = None,
+        driver: WebDriver = None,
+        payload: dict = None,
     ) -> None:
         """Initialize a Post instance with the DOM element representing the Reddit post
         and the Selenium WebDriver. Extracts post-related attributes.
@@ -34,6 +141,8 @@ class Post:
         Args:
             card: The DOM element containing the Reddit post to analyze.
             driver: The Selenium WebDriver used to interact with the webpage.
+            payload: (Optional) A dict produced by extract_posts. When given,
+                no further WebDriver calls are made.
 
         Returns:
             A tuple containing user info, title, content, vote count, comment count,
@@ -43,6 +152,55 @@ class Post:
         self.error = False
         self.post = None
 
+        if payload is not None:
+            self._from_payload(payload)
+        else:
+            self._from_card(card, driver)
+
+        self.post = (
+            self.user,
+            self.title,
+            self.content,
+            self.voteCount,
+            self.commentCount,
+            self.timestamp,
+        )
+
+    def _from_payload(self, payload: dict) -> None:
+        """Populate the post attributes from an extract_posts payload.
+
+        Args:
+            payload: The serialized card as returned by extract_posts.
+        """
+
+        def field(key):
+            value = payload.get(key)
+            if value is None:
+                self.error = True
+                return "skip"
+            return value
+
+        self.postId = field("postId")
+        self.user = field("user")
+        self.title = field("title")
+
+        paragraphs = payload.get("paragraphs") or []
+        if len(paragraphs) == 0:
+            self.content = payload.get("link") or []
+        else:
+            self.content = "".join(paragraphs)
+
+        self.voteCount = payload.get("voteCount") or "skip"
+        self.commentCount = payload.get("commentCount") or "skip"
+        self.timestamp = field("timestamp")
+
+    def _from_card(self, card: WebElement, driver: WebDriver) -> None:
+        """Populate the post attributes by querying the card field by field.
+
+        Args:
+            card: The DOM element containing the Reddit post to analyze.
+            driver: The Selenium WebDriver used to interact with the webpage.
+        """
         try:
             self.postId = card.find_element("xpath", ".//shreddit-post").get_attribute(
                 "id"
@@ -119,14 +277,3 @@ class Post:
         except NoSuchElementException:
             self.error = True
             self.timestamp = "skip"
-
-        self.post = (
-            self.user,
-            self.title,
-            self.content,
-            self.voteCount,
-            self.commentCount,
-            self.timestamp,
-        )
-
-        pass
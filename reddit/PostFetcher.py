@@ -0,0 +1,159 @@
+import asyncio
+import random
+import time
+
+import aiohttp
+
+
+class TokenBucket:
+    """An asyncio token bucket limiting how many requests start per second.
+
+    Attributes:
+        rate: Tokens added per second.
+        capacity: Maximum number of tokens, i.e. the largest burst allowed.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class PostFetcher:
+    """Fetches Reddit post JSON (post + comment tree) over plain HTTP.
+
+    Requests share one pooled aiohttp session, at most `concurrency` are in flight
+    at once and new ones are started at no more than `rate` per second. 429 and 5xx
+    responses are retried with exponential backoff, honouring Retry-After when
+    Reddit sends it.
+
+    Attributes:
+        url: URL template for a post's JSON, formatted with postid.
+        concurrency: Maximum number of requests in flight.
+        rate: Maximum number of requests started per second.
+        burst: Number of requests that may start back to back.
+        retries: Attempts per post before giving up.
+        backoff: Base delay in seconds for the exponential backoff.
+        stats: Counts of fetched, failed and retried requests.
+    """
+
+    URL = "https://www.reddit.com/comments/{postid}.json"
+
+    def __init__(
+        self,
+        url: str = None,
+        concurrency: int = 8,
+        rate: float = 1.0,
+        burst: int = 5,
+        retries: int = 5,
+        backoff: float = 2.0,
+        timeout: float = 30,
+        user_agent: str = "webScrapers/1.0",
+    ) -> None:
+        self.url = url or self.URL
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.headers = {"User-Agent": user_agent}
+        self.stats = {"fetched": 0, "failed": 0, "retried": 0}
+
+    def run(self, postids: list) -> list:
+        """
+        Fetch every post from synchronous code.
+
+        Parameters:
+            postids (list): IDs of the posts to fetch.
+
+        Returns:
+            list: The parsed JSON of every post, in the same order, with None for
+            posts that could not be fetched.
+        """
+        return asyncio.run(self.fetch_all(postids))
+
+    async def fetch_all(self, postids: list) -> list:
+        """
+        Fetch every post concurrently.
+
+        Parameters:
+            postids (list): IDs of the posts to fetch.
+
+        Returns:
+            list: The parsed JSON of every post, in the same order, with None for
+            posts that could not be fetched.
+        """
+        bucket = TokenBucket(self.rate, self.burst)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+
+        async with aiohttp.ClientSession(
+            connector=connector, headers=self.headers, timeout=self.timeout
+        ) as session:
+            return await asyncio.gather(
+                *(self.fetch(session, semaphore, bucket, postid) for postid in postids)
+            )
+
+    async def fetch(self, session, semaphore, bucket, postid: str):
+        """
+        Fetch one post, retrying on rate limiting and server errors.
+
+        Returns:
+            The parsed JSON, or None if every attempt failed.
+        """
+        url = self.url.format(postid=postid)
+
+        async with semaphore:
+            for attempt in range(self.retries):
+                await bucket.acquire()
+                delay = self.backoff * 2**attempt + random.uniform(0, self.backoff)
+
+                try:
+                    async with session.get(url) as response:
+                        if response.status == 200:
+                            try:
+                                data = await response.json(content_type=None)
+                            except (ValueError, aiohttp.ContentTypeError) as e:
+                                # e.g. an HTML block or interstitial page
+                                print(f"{postid}: response is not JSON ({e})")
+                                break
+                            if data is None:
+                                print(f"{postid}: empty response")
+                                break
+                            self.stats["fetched"] += 1
+                            return data
+
+                        if response.status != 429 and response.status < 500:
+                            print(f"{postid}: HTTP {response.status}")
+                            break
+
+                        retry_after = response.headers.get("Retry-After")
+                        if retry_after and retry_after.isdigit():
+                            delay = max(delay, int(retry_after))
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    print(f"{postid}: {e}")
+
+                if attempt + 1 < self.retries:
+                    self.stats["retried"] += 1
+                    await asyncio.sleep(delay)
+
+        self.stats["failed"] += 1
+        return None
@@ -1,37 +1,76 @@
+import os
+import queue
 import random
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from bs4 import BeautifulSoup
 import pandas as pd
 from selenium import webdriver
 
 from selenium.webdriver.common.by import By
-from Post import Post
+from comments import comment_columns, save_comments_csv
+from Post import Post, extract_posts, post_id
+from PostFetcher import PostFetcher
+
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common")
+)
+from Scroller import Scroller  # noqa: E402
+from SeenIndex import SeenIndex  # noqa: E402
 
 from selenium.webdriver.common.action_chains import ActionChains
 
 import csv
 
+POST_SELECTOR = 'article[class="w-full m-0"]'
+
 
 class ScrapeReddit:
-    def __init__(self):
+    def __init__(
+        self, seen_path=None, headless=False, seen=None, lean=None, driver=None
+    ):
         """
         Initializes the ScrapeReddit class with a Firefox web driver, an empty posts list,
-        and a set to track unique post IDs. An ActionChains object is also initialized for scrolling.
+        and an index to track unique post IDs. An ActionChains object and an adaptive Scroller
+        are also initialized for scrolling.
 
         Parameters:
-            None
+            seen_path (str, optional): File the post ID index is persisted to. Posts stored
+                by a previous run with the same file are skipped. Defaults to None.
+            headless (bool, optional): Run Firefox without a window. Defaults to False.
+            seen (SeenIndex, optional): An existing index to share with other scrapers.
+                Takes precedence over seen_path. Defaults to None.
+            lean (LeanBrowser, optional): Run Firefox with this lean profile: headless,
+                without images, fonts, autoplay or trackers, measuring requests and
+                bytes per subreddit. Defaults to None.
+            driver (WebDriver, optional): Drive this already running browser instead of
+                starting a new one. Defaults to None.
         Returns:
             None
         """
-        self.driver = webdriver.Firefox()
+        self.lean = lean
+        if driver is None:
+            options = webdriver.FirefoxOptions()
+            if headless:
+                options.add_argument("-headless")
+            if lean:
+                lean.firefox_options(options)
+            driver = webdriver.Firefox(options=options)
+        self.driver = driver
         self.posts = []
 
         self.postids = []
-        self.postsId = set()
+        # Ids this scraper added to postsId whose rows are not saved yet
+        self.unsaved_ids = []
+        self.postsId = seen if seen is not None else SeenIndex(seen_path)
         self.actions = ActionChains(self.driver)
+        self.scroller = Scroller(self.driver, card_selector=POST_SELECTOR)
 
         self.data = []
+        self.written = 0
 
     def destroy(self):
         """
@@ -49,28 +88,21 @@ class ScrapeReddit:
         Returns:
             str: The entire content of the webpage after scrolling to the bottom.
         """
-        current_height = self.driver.execute_script(
-            "window.scrollTo(0,document.body.scrollHeight);"
-        )
-        while True:
-            self.driver.execute_script("window.scrollTo(0,document.body.scrollHeight);")
-            time.sleep(2)
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            if (
-                new_height == current_height
-            ):  # this means we have reached the end of the page!
-                html = self.driver.page_source
-                break
-            current_height = new_height
-        return html
-
-    def get_posts(self, subreddits=[], postCount=50):
+        self.scroller.reset()
+        while self.scroller.scrolling:
+            self.scroller.scroll()
+        return self.driver.page_source
+
+    def get_posts(self, subreddits=[], postCount=50, batch=True):
         """
         Fetches a specified number of posts from each given subreddit and adds them to the internal list.
 
         Parameters:
             subreddits (list): List of subreddit names to scrape posts from.
             postCount (int): Number of posts to fetch per subreddit. Defaults to 30.
+            batch (bool): Serialize all new cards with one injected script per batch
+                instead of querying every field separately. Cards the script cannot
+                parse fall back to the per-field path. Defaults to True.
 
         Returns:
             None
@@ -78,51 +110,186 @@ class ScrapeReddit:
             Exception: If there's an error accessing Reddit's API or the response is malformed.
         """
         for link in subreddits:
-            self.driver.get(link)
-            self.driver.maximize_window()
-            time.sleep(2)
+            self._scrape_subreddit(link, postCount, batch)
+            self._write_raw()
 
-            added_posts = 0
+    def get_posts_concurrent(self, subreddits=[], postCount=50, workers=4, batch=True):
+        """
+        Fetches posts from several subreddits at once, one Firefox per worker.
 
-            while added_posts < postCount:
-                self._getPosts()
-                for card in self.posts:
-                    postId = str(card)
+        This instance's browser is the first worker and the others are headless.
+        Each worker takes the next subreddit from a shared queue, so a slow subreddit
+        never holds up the others. All workers share this instance's post ID index,
+        and their posts are merged into this instance's data and raw CSV as each
+        subreddit finishes.
 
-                    if postId not in self.postsId:
-                        self.postsId.add(postId)
+        Parameters:
+            subreddits (list): List of subreddit names to scrape posts from.
+            postCount (int): Number of posts to fetch per subreddit. Defaults to 50.
+            workers (int): Number of browsers to run concurrently. Defaults to 4.
+            batch (bool): Passed on to the per-subreddit scraping, see get_posts.
 
-                        try:
-                            post = Post(
-                                card=card,
-                                driver=self.driver,
-                            )
+        Returns:
+            dict: Post count and seconds taken for every subreddit.
+        """
+        pending = queue.Queue()
+        for link in subreddits:
+            pending.put(link)
+
+        workers = max(1, min(workers, len(subreddits)))
+        helpers = []
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers - 1) as executor:
+                helpers = list(
+                    executor.map(
+                        lambda _: ScrapeReddit(
+                            headless=True, seen=self.postsId, lean=self.lean
+                        ),
+                        range(workers - 1),
+                    )
+                )
+
+        lock = threading.Lock()
+        report = {}
+
+        def work(scraper):
+            while True:
+                try:
+                    link = pending.get_nowait()
+                except queue.Empty:
+                    break
+
+                start = time.perf_counter()
+                try:
+                    added = scraper._scrape_subreddit(link, postCount, batch)
+                except Exception as e:
+                    print(f"{link}: {e}")
+                    added = 0
+
+                with lock:
+                    self.data.extend(scraper.data)
+                    self.postids.extend(scraper.postids)
+                    self.unsaved_ids.extend(scraper.unsaved_ids)
+                    scraper.data = []
+                    scraper.postids = []
+                    scraper.unsaved_ids = []
+                    self._write_raw()
+                    report[link] = {
+                        "posts": added,
+                        "seconds": round(time.perf_counter() - start, 2),
+                    }
+
+        # This instance's browser is one of the workers, scraping into its own lists
+        # so only the merge in work() changes self.data
+        own = ScrapeReddit(seen=self.postsId, lean=self.lean, driver=self.driver)
+        threads = [threading.Thread(target=work, args=(s,)) for s in [own] + helpers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for scraper in helpers:
+            scraper.destroy()
+
+        for link, stats in report.items():
+            print(f"{link}: {stats['posts']} posts in {stats['seconds']}s")
+        return report
+
+    def _scrape_subreddit(self, link, postCount, batch=True):
+        """
+        Scrolls one subreddit until postCount new posts have been added or the feed ends.
 
-                            self.data.append(post.post)
-                            added_posts += 1
+        Parameters:
+            link (str): URL of the subreddit.
+            postCount (int): Number of posts to fetch.
+            batch (bool): See get_posts.
 
-                        except Exception as e:
-                            print(e)
-                        time.sleep(1)
+        Returns:
+            int: Number of posts added to self.data.
+        """
+        self.driver.get(link)
+        self.driver.maximize_window()
+        self.scroller.reset()
+        self.scroller.wait_for_cards()
+
+        added_posts = 0
 
-                if added_posts > 20:
-                    self.driver.execute_script(
-                        "window.scrollTo(0, document.body.scrollHeight);"
+        while added_posts < postCount and self.scroller.scrolling:
+            self._getPosts()
+
+            payloads = [None] * len(self.posts)
+            if batch:
+                try:
+                    payloads = extract_posts(
+                        self.driver, self.posts, exclude=self.postsId.recent_ids()
                     )
-                    time.sleep(2)
-
-            fields = [
-                "user",
-                "title",
-                "content",
-                "voteCount",
-                "commentCount",
-                "timestamp",
-            ]
-            with open("raw_reddit_posts.csv", "w", encoding="utf-8") as file:
-                write = csv.writer(file)
+                except Exception as e:
+                    print(e)
+
+            for card, payload in zip(self.posts, payloads):
+                postId = payload["postId"] if payload else post_id(card)
+
+                if postId is None or postId in self.postsId:
+                    continue
+
+                try:
+                    post = Post(card=card, driver=self.driver, payload=payload)
+                    if post.error and payload is not None:
+                        post = Post(card=card, driver=self.driver)
+                    if post.error:
+                        continue
+
+                    # Only ids of stored rows are marked seen and later persisted
+                    if not self.postsId.add(postId):
+                        continue
+                    self.data.append(post.post)
+                    self.unsaved_ids.append(postId)
+                    self.postids.append(postId.removeprefix("t3_"))
+                    added_posts += 1
+
+                except Exception as e:
+                    print(e)
+
+            self.scroller.scroll()
+            if self.lean:
+                # Firefox keeps only 250 timing entries unless they are read often
+                self.lean.record(self.driver, page=link)
+
+        print(f"{link}: {added_posts} posts, scrolling {self.scroller.stats()}")
+        return added_posts
+
+    def _write_raw(self):
+        """
+        Writes the posts collected so far to raw_reddit_posts.csv and persists their IDs.
+
+        Returns:
+            None
+        """
+        fields = [
+            "user",
+            "title",
+            "content",
+            "voteCount",
+            "commentCount",
+            "timestamp",
+        ]
+        if self.postsId.path:
+            # Resumable crawls append to the rows stored by earlier runs
+            rows, mode = self.data[self.written :], "a"
+        else:
+            rows, mode = self.data, "w"
+        header = mode == "w" or not os.path.exists("raw_reddit_posts.csv")
+
+        with open("raw_reddit_posts.csv", mode, encoding="utf-8") as file:
+            write = csv.writer(file)
+            if header:
                 write.writerow(fields)
-                write.writerows(self.data)
+            write.writerows(rows)
+        self.written = len(self.data)
+        # Only this scraper's ids: other workers sharing the index may not
+        # have saved the rows of theirs yet
+        self.postsId.flush(self.unsaved_ids)
+        self.unsaved_ids = []
 
     def _getPosts(self):
         """
@@ -136,9 +303,7 @@ class ScrapeReddit:
         Returns:
             list: List of post links found in the HTML content.
         """
-        self.posts = self.driver.find_elements(
-            By.CSS_SELECTOR, 'article[class="w-full m-0"]'
-        )
+        self.posts = self.driver.find_elements(By.CSS_SELECTOR, POST_SELECTOR)
 
     def get_data(self, postid):
         """
@@ -150,7 +315,7 @@ class ScrapeReddit:
         Returns:
             str: A string containing the full text content and links from Reddit's API response.
         """
-        base_url = "https://reddit.com/"
+        base_url = "https://reddit.com/comments/"
         url = base_url + postid + ".json"
         self.driver.get(url)
         self.driver.maximize_window()
@@ -160,21 +325,38 @@ class ScrapeReddit:
         time.sleep(3)
         return text
 
-    def get_post_details(self):
+    def get_post_details(self, use_http=True, concurrency=8, rate=1.0):
         """
-        Reads a list of subreddit IDs from a file and initiates the post fetching process for each.
+        Fetches the JSON (post and comment tree) of every post collected by get_posts.
 
         Parameters:
-            file_path (str): Path to the text file containing subreddit IDs.
+            use_http (bool): Fetch the JSON concurrently over plain HTTP with PostFetcher
+                and parse it with get_post_info. If False, every post is loaded one by
+                one in the browser and its raw text is returned. Defaults to True.
+            concurrency (int): Maximum number of HTTP requests in flight. Defaults to 8.
+            rate (float): Maximum number of HTTP requests started per second. Defaults to 1.0.
 
         Returns:
-            None
+            list: The parsed JSON of every post (None for failures) when use_http is True,
+            otherwise the raw page text of every post.
         """
         jsons = []
         count = 1
         if not self.postids:
             print("No post ids found. Please run get_posts() first.")
             return
+
+        if use_http:
+            fetcher = PostFetcher(concurrency=concurrency, rate=rate)
+            jsons = fetcher.run(self.postids)
+            print(f"Fetched post details: {fetcher.stats}")
+
+            self.jsons = jsons
+            self.post_info = [
+                self.get_post_info(json_data) for json_data in jsons if json_data
+            ]
+            return jsons
+
         for postid in self.postids:
             print(postid, count)
             text = self.get_data(postid)
@@ -185,49 +367,42 @@ class ScrapeReddit:
         self.jsons = jsons
         return jsons
 
+    @staticmethod
     def get_post_info(json_data):
         """
-        Gets the post body, all comments and their replies,
-        the user IDs of the post, comments, and replies,
-        and the timestamps of the post, comments, and replies
-        from the JSON data.
+        Gets the post body, user ID and timestamp, and every comment of the thread
+        at any depth from the JSON data.
+
+        Comments are returned as a flat columnar table (see comments.COMMENT_FIELDS)
+        in which replies point at their parent through parent_id. The ids of
+        unexpanded "more" children are returned separately so they can be fetched
+        later in bulk.
         """
 
         post = json_data[0]["data"]["children"][0]["data"]
-        post_body = post["title"]
-        post_user = post["author"]
-        post_time = post["created_utc"]
-        comments = json_data[1]["data"]["children"]
-        comments_list = []
-        for comment, idx in zip(comments, range(len(comments))):
-            comment_body = comment["data"]["body"]
-            comment_user = comment["data"]["author"]
-            comment_time = comment["data"]["created_utc"]
-            comments_list.append(
-                {"body": comment_body, "user": comment_user, "time": comment_time}
-            )
-            comment_replies = []
-
-            # append reply to the comment to which it belongs
-
-            if comment["data"]["replies"] != "":
-                replies = comment["data"]["replies"]["data"]["children"]
-                for reply in replies:
-                    reply_body = reply["data"]["body"]
-                    reply_user = reply["data"]["author"]
-                    reply_time = reply["data"]["created_utc"]
-                    comment_replies.append(
-                        {"body": reply_body, "user": reply_user, "time": reply_time}
-                    )
-            comments_list[idx]["replies"] = comment_replies
+        more = []
+        comments = comment_columns(json_data, more)
 
         return {
-            "post_body": post_body,
-            "post_user": post_user,
-            "post_time": post_time,
-            "comments": comments_list,
+            "post_body": post["title"],
+            "post_user": post["author"],
+            "post_time": post["created_utc"],
+            "comments": comments,
+            "more": more,
         }
 
+    def save_comments_csv(self, output_path="reddit_comments.csv"):
+        """
+        Streams the comments of every post fetched by get_post_details to a CSV file.
+
+        Parameters:
+            output_path (str): Path of the CSV file to write.
+
+        Returns:
+            list: The ids of every unexpanded "more" child across all posts.
+        """
+        return save_comments_csv(self.jsons, output_path)
+
     def save_to_csv(self):
         data = {
             "User": [tweet[0] for tweet in self.data],
@@ -248,5 +423,7 @@ class ScrapeReddit:
 
         pd.set_option("display.max_colwidth", None)
         df.to_csv("./reddit_posts_df.csv", index=False, encoding="utf-8")
+        self.postsId.flush(self.unsaved_ids)
+        self.unsaved_ids = []
 
         pass
@@ -0,0 +1,112 @@
+"""Flattening of Reddit comment trees from a post's .json listing.
+
+The tree is walked with an explicit stack instead of recursion, so arbitrarily
+deep threads neither hit the recursion limit nor build nested dicts per node.
+Comments come out as flat rows that can be written straight to disk.
+
+Functions:
+    iter_comments: Yields one row per comment, at any depth.
+    comment_columns: Collects the rows of one post into a columnar dict.
+    save_comments_csv: Streams the comments of many posts into one CSV file.
+"""
+
+import csv
+
+COMMENT_FIELDS = [
+    "link_id",
+    "id",
+    "parent_id",
+    "depth",
+    "author",
+    "created_utc",
+    "body",
+]
+
+
+def iter_comments(json_data, more=None):
+    """
+    Yield every comment of a post depth-first, in the order Reddit displays them.
+
+    Parameters:
+        json_data (list): The parsed JSON of a post's .json URL.
+        more (list, optional): Receives the ids of unexpanded "more" children, so
+            they can be fetched later in bulk (e.g. via /api/morechildren).
+
+    Yields:
+        tuple: One row per comment, in COMMENT_FIELDS order.
+    """
+    children = json_data[1]["data"]["children"]
+    stack = [(child, 0) for child in reversed(children)]
+
+    while stack:
+        node, depth = stack.pop()
+        kind = node.get("kind")
+        data = node.get("data", {})
+
+        if kind == "more":
+            if more is not None:
+                more.extend(data.get("children", []))
+            continue
+        if kind != "t1":
+            continue
+
+        yield (
+            data.get("link_id"),
+            data.get("id"),
+            data.get("parent_id"),
+            data.get("depth", depth),
+            data.get("author"),
+            data.get("created_utc"),
+            data.get("body", ""),
+        )
+
+        replies = data.get("replies")
+        if replies:
+            kids = replies["data"]["children"]
+            stack.extend((kid, depth + 1) for kid in reversed(kids))
+
+
+def comment_columns(json_data, more=None):
+    """
+    Collect the comments of one post into a columnar table.
+
+    Parameters:
+        json_data (list): The parsed JSON of a post's .json URL.
+        more (list, optional): Receives the ids of unexpanded "more" children.
+
+    Returns:
+        dict: One list per field in COMMENT_FIELDS, all of the same length.
+    """
+    columns = {field: [] for field in COMMENT_FIELDS}
+    appends = [columns[field].append for field in COMMENT_FIELDS]
+
+    for row in iter_comments(json_data, more):
+        for append, value in zip(appends, row):
+            append(value)
+
+    return columns
+
+
+def save_comments_csv(jsons, output_path="reddit_comments.csv"):
+    """
+    Stream the comments of many posts into one CSV file.
+
+    Rows are written as they are produced, so memory stays bounded by the
+    largest single post rather than by the whole crawl.
+
+    Parameters:
+        jsons (iterable): Parsed post JSON, as returned by get_post_details.
+            None entries (failed fetches) are skipped.
+        output_path (str): Path of the CSV file to write.
+
+    Returns:
+        list: The ids of every unexpanded "more" child across all posts.
+    """
+    more = []
+    with open(output_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(COMMENT_FIELDS)
+        for json_data in jsons:
+            if json_data:
+                writer.writerows(iter_comments(json_data, more))
+    return more
@@ -3,7 +3,13 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import hashlib
+import os
+import sqlite3
+
 from scrapy import signals
+from scrapy.utils.project import data_path
+from w3lib.url import canonicalize_url
 
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
@@ -101,3 +107,95 @@ class Scrapper1DownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class ContentHashMiddleware:
+    # Incremental crawling: remembers a hash of every page body between runs
+    # and flags responses whose content did not change since the last run,
+    # so the spider can skip re-parsing them. Links on unchanged pages are
+    # still followed, since the pages they lead to may have changed.
+    #
+    # Enabled with INCREMENTAL_ENABLED = True. Hashes are kept in an SQLite
+    # file at INCREMENTAL_HASHES_PATH, inside the project data dir when
+    # relative, keyed on the canonical URL like the spider's visited set.
+    # They are committed every INCREMENTAL_COMMIT_EVERY pages, so a killed
+    # crawl keeps most of what it hashed.
+    #
+    # It also counts the responses served by HttpCacheMiddleware (fresh hits
+    # and 304 revalidations) and reports the ratio as httpcache/hit_ratio.
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        s = cls(
+            crawler.stats,
+            data_path(settings.get("INCREMENTAL_HASHES_PATH", "content_hashes.db")),
+            settings.getbool("INCREMENTAL_ENABLED"),
+            settings.getint("INCREMENTAL_COMMIT_EVERY", 100),
+        )
+        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
+        return s
+
+    def __init__(self, stats, path, enabled, commit_every=100):
+        self.stats = stats
+        self.path = path
+        self.enabled = enabled
+        self.commit_every = commit_every
+        self.conn = None
+        self.uncommitted = 0
+
+    def process_response(self, request, response, spider):
+        self.stats.inc_value("httpcache/responses")
+        if "cached" in response.flags:
+            self.stats.inc_value("httpcache/served_from_cache")
+
+        if not self.enabled:
+            return response
+
+        url = canonicalize_url(request.url)
+        digest = hashlib.sha1(response.body).hexdigest()
+        row = self.conn.execute(
+            "SELECT digest FROM hashes WHERE url = ?", (url,)
+        ).fetchone()
+
+        if row is None:
+            self.stats.inc_value("incremental/new")
+        elif row[0] == digest:
+            self.stats.inc_value("incremental/unchanged")
+            request.meta["content_unchanged"] = True
+            return response
+        else:
+            self.stats.inc_value("incremental/changed")
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO hashes (url, digest) VALUES (?, ?)", (url, digest)
+        )
+        self.uncommitted += 1
+        if self.uncommitted >= self.commit_every:
+            self.conn.commit()
+            self.uncommitted = 0
+        return response
+
+    def spider_opened(self, spider):
+        if not self.enabled:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes (url TEXT PRIMARY KEY, digest TEXT NOT NULL)"
+        )
+        known = self.conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        spider.logger.info("Incremental crawl: %d known pages" % known)
+
+    def spider_closed(self, spider):
+        total = self.stats.get_value("httpcache/responses", 0)
+        if total:
+            cached = self.stats.get_value("httpcache/served_from_cache", 0)
+            self.stats.set_value("httpcache/hit_ratio", round(cached / total, 3))
+
+        if self.conn is not None:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
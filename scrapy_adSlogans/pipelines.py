@@ -4,10 +4,161 @@
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
 
+import hashlib
+import os
+import sqlite3
+
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from scrapy.exceptions import DropItem
+
+from .utils.cleaner import normalize_record
+
+
+class SlogansPipeline:
+    """
+    Normalizes scraped slogans and stores them in batches, deduplicated on write.
+
+    Company and quote are cleaned the same way read_jsonl_to_csv cleans them,
+    and items without either are dropped. Rows are buffered and written every
+    SLOGANS_BATCH_SIZE items:
+
+    - sqlite (default): one transaction per batch into the slogans table, whose
+      unique (company, quote) index makes SQLite skip duplicates, also across runs.
+    - parquet: SLOGANS_PATH is a dataset directory, and each run adds a new
+      part file with one row group per batch. Duplicates are skipped with a set
+      of (company, quote) digests, seeded from the existing parts so earlier
+      runs are kept and not stored again. Requires pyarrow.
+
+    Settings:
+        SLOGANS_STORE: "sqlite" or "parquet".
+        SLOGANS_PATH: Output file (directory for parquet). Defaults to
+            slogans.db / slogans.parquet.
+        SLOGANS_BATCH_SIZE: Items per batch.
+    """
+
+    COLUMNS = ["category", "subcategory", "company", "quote"]
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        store = settings.get("SLOGANS_STORE", "sqlite")
+        return cls(
+            crawler.stats,
+            store,
+            settings.get("SLOGANS_PATH")
+            or f"slogans.{'db' if store == 'sqlite' else 'parquet'}",
+            settings.getint("SLOGANS_BATCH_SIZE", 500),
+        )
+
+    def __init__(self, stats, store, path, batch_size):
+        if store not in ("sqlite", "parquet"):
+            raise ValueError(f"Unsupported SLOGANS_STORE: {store}")
+        self.stats = stats
+        self.store = store
+        self.path = path
+        self.batch_size = batch_size
+        self.batch = []
+        self.seen = set()
+        self.conn = None
+        self.writer = None
 
+    def open_spider(self, spider):
+        if self.store == "sqlite":
+            self.conn = sqlite3.connect(self.path)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS slogans "
+                "(category TEXT, subcategory TEXT, company TEXT NOT NULL, quote TEXT NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS slogans_company_quote "
+                "ON slogans (company, quote)"
+            )
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if os.path.isfile(self.path):
+                raise ValueError(
+                    f"{self.path} is a file; the parquet store is a directory of parts"
+                )
+            self.schema = pa.schema([(column, pa.string()) for column in self.COLUMNS])
+            os.makedirs(self.path, exist_ok=True)
+
+            parts = sorted(f for f in os.listdir(self.path) if f.endswith(".parquet"))
+            for part in parts:
+                table = pq.read_table(
+                    os.path.join(self.path, part), columns=["company", "quote"]
+                )
+                for company, quote in zip(*table.to_pydict().values()):
+                    self.seen.add(self._digest(company, quote))
+            self.part_path = os.path.join(self.path, f"part-{len(parts):05d}.parquet")
+            spider.logger.info(
+                "Parquet store has %d slogans in %d parts"
+                % (len(self.seen), len(parts))
+            )
 
-class Scrapper1Pipeline:
     def process_item(self, item, spider):
+        row = normalize_record(ItemAdapter(item).asdict())
+        if row is None:
+            raise DropItem("Missing company or quote")
+
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
         return item
+
+    def flush(self):
+        """Writes the buffered rows, skipping duplicates."""
+        if not self.batch:
+            return
+
+        if self.store == "sqlite":
+            before = self.conn.total_changes
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO slogans VALUES (?, ?, ?, ?)", self.batch
+                )
+            stored = self.conn.total_changes - before
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            rows = [row for row in self.batch if self._is_new(row)]
+            if rows:
+                if self.writer is None:
+                    self.writer = pq.ParquetWriter(self.part_path, self.schema)
+                columns = {
+                    column: [row[index] for row in rows]
+                    for index, column in enumerate(self.COLUMNS)
+                }
+                self.writer.write_table(pa.table(columns, schema=self.schema))
+            stored = len(rows)
+
+        self.stats.inc_value("slogans/stored", stored)
+        self.stats.inc_value("slogans/duplicates", len(self.batch) - stored)
+        self.batch = []
+
+    @staticmethod
+    def _digest(company, quote):
+        return hashlib.blake2b(
+            f"{company}\0{quote}".encode("utf-8"), digest_size=8
+        ).digest()
+
+    def _is_new(self, row):
+        digest = self._digest(row[2], row[3])
+        if digest in self.seen:
+            return False
+        self.seen.add(digest)
+        return True
+
+    def close_spider(self, spider):
+        self.flush()
+        if self.conn is not None:
+            self.conn.close()
+        if self.writer is not None:
+            self.writer.close()
+        spider.logger.info(
+            "Stored %d slogans in %s (%s)"
+            % (self.stats.get_value("slogans/stored", 0), self.path, self.store)
+        )
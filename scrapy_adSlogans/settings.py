@@ -50,9 +50,16 @@ ROBOTSTXT_OBEY = True
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
+DOWNLOADER_MIDDLEWARES = {
 #    "scrapper1.middlewares.Scrapper1DownloaderMiddleware": 543,
-#}
+    "scrapper1.middlewares.ContentHashMiddleware": 800,
+}
+
+# Incremental mode: skip re-parsing pages whose content has not changed since
+# the last run (run with -s INCREMENTAL_ENABLED=True)
+INCREMENTAL_ENABLED = False
+INCREMENTAL_HASHES_PATH = "content_hashes.db"
+INCREMENTAL_COMMIT_EVERY = 100
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -62,9 +69,14 @@ ROBOTSTXT_OBEY = True
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
-#ITEM_PIPELINES = {
-#    "scrapper1.pipelines.Scrapper1Pipeline": 300,
-#}
+ITEM_PIPELINES = {
+    "scrapper1.pipelines.SlogansPipeline": 300,
+}
+
+# Where SlogansPipeline stores the slogans: "sqlite" or "parquet"
+SLOGANS_STORE = "sqlite"
+SLOGANS_PATH = None
+SLOGANS_BATCH_SIZE = 500
 
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
@@ -81,11 +93,15 @@ ROBOTSTXT_OBEY = True
 
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
-#HTTPCACHE_ENABLED = True
-#HTTPCACHE_EXPIRATION_SECS = 0
-#HTTPCACHE_DIR = "httpcache"
-#HTTPCACHE_IGNORE_HTTP_CODES = []
-#HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+HTTPCACHE_ENABLED = True
+HTTPCACHE_EXPIRATION_SECS = 0
+HTTPCACHE_DIR = "httpcache"
+HTTPCACHE_IGNORE_HTTP_CODES = [500, 502, 503, 504, 408, 429]
+HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+# Revalidate stale pages with If-None-Match / If-Modified-Since instead of
+# downloading them again, and store them gzipped
+HTTPCACHE_POLICY = "scrapy.extensions.httpcache.RFC2616Policy"
+HTTPCACHE_GZIP = True
 
 # Set settings whose default value is deprecated to a future-proof value
 REQUEST_FINGERPRINTER_IMPLEMENTATION = "2.7"
@@ -1,4 +1,5 @@
 import scrapy  # type: ignore
+from w3lib.url import canonicalize_url  # type: ignore
 
 
 class AdvertisingSlogansSpider(scrapy.Spider):
@@ -17,11 +18,11 @@ class AdvertisingSlogansSpider(scrapy.Spider):
     getCat(response)
         Extracts and stores categories from the response's selector.
 
-    getSubcat(response, cat, visited)
+    getSubcat(response, cat)
         Follows links to subcategories within a given category and collects subcategory URLs.
         It also tracks visited URLs in a set to avoid reprocessing.
 
-    getQuote(response, cat, subcat, visited)
+    getQuote(response, cat, subcat)
         Processes individual slogan paragraphs on a page, extracting the slogan along with company information.
         It follows links to additional pages recursively until all slogans are collected.
 
@@ -46,6 +47,38 @@ class AdvertisingSlogansSpider(scrapy.Spider):
         self.catList = {}
         self.subCatList = []
         self.visited = set()
+        self.duplicates = 0
+
+    def _follow(self, response, href, callback, cb_kwargs):
+        """
+        Follow a link unless its page was already requested by this spider.
+
+        Links are resolved against the response and canonicalized (fragment
+        dropped, query sorted), so the same page reached through a relative and
+        an absolute link is only requested once.
+
+        Returns:
+            Request: The request to yield, or None if the page was already visited.
+        """
+        url = canonicalize_url(response.urljoin(href))
+        if url in self.visited:
+            self.duplicates += 1
+            self.crawler.stats.inc_value("visited/duplicates_skipped")
+            return None
+
+        self.visited.add(url)
+        return response.follow(url, callback, cb_kwargs=cb_kwargs)
+
+    def _markVisited(self, response):
+        """Add the URL a response was served from to the visited set."""
+        self.visited.add(canonicalize_url(response.url))
+
+    def closed(self, reason):
+        self.logger.info(
+            "Visited %d pages, skipped %d duplicate links",
+            len(self.visited),
+            self.duplicates,
+        )
 
     def parse(self, response):
         """
@@ -54,14 +87,15 @@ class AdvertisingSlogansSpider(scrapy.Spider):
         Yields:
             Response: Follows each category URL and processes it.
         """
+        self._markVisited(response)
         self.getCat(response)
 
         for key in self.catList.keys():
             catUrl = self.catList[key]
 
-            yield response.follow(
-                catUrl, self.getSubcat, cb_kwargs={"cat": key, "visited": []}
-            )
+            request = self._follow(response, catUrl, self.getSubcat, {"cat": key})
+            if request:
+                yield request
 
     def getCat(self, response):
         """
@@ -80,7 +114,7 @@ class AdvertisingSlogansSpider(scrapy.Spider):
                 self.catList[cat.css("::text").get()] = val
         return
 
-    def getSubcat(self, response, cat, visited):
+    def getSubcat(self, response, cat):
         """
         Process subcategories by following their links.
 
@@ -92,47 +126,28 @@ class AdvertisingSlogansSpider(scrapy.Spider):
         Yields:
             Response: Follows each subcategory or next page.
         """
+        self._markVisited(response)
         options = response.css('select[name="select3"] option')
+
         if options:
             for subCat in options:
                 val = subCat.css('::attr("value")').get()
 
                 if val != "#":
-                    yield response.follow(
+                    request = self._follow(
+                        response,
                         val,
                         self.getQuote,
-                        cb_kwargs={
-                            "cat": cat,
-                            "subcat": subCat.css("::text").get(),
-                            "visited": [],
-                        },
+                        {"cat": cat, "subcat": subCat.css("::text").get()},
                     )
+                    if request:
+                        yield request
                     self.subCatList.append(val)
-
         else:
-            visited.append(response.request.url)
-            for paragraph in response.css("p.paragraf"):
-                quote = paragraph.css("span.slogan::text").get()
-
-                if quote:
-                    yield {
-                        "cat": cat,
-                        "subcat": None,
-                        "company": paragraph.css("::text").get(),
-                        "quote": paragraph.css("span.slogan::text").get(),
-                    }
-                next_pages = paragraph.css('a::attr("href")').getall()
-
-                for page in next_pages:
-                    if page not in visited:
-                        yield response.follow(
-                            page,
-                            self.getQuote,
-                            cb_kwargs={"cat": cat, "subcat": None, "visited": visited},
-                        )
+            yield from self.getQuote(response, cat, None)
         return
 
-    def getQuote(self, response, cat, subcat, visited):
+    def getQuote(self, response, cat, subcat):
         """
         Extract slogan information from each paragraph.
 
@@ -143,11 +158,14 @@ class AdvertisingSlogansSpider(scrapy.Spider):
         Yields:
             dict: Contains 'cat', 'subcat', 'company', 'quote'
         """
-        visited.append(response.request.url)
+        self._markVisited(response)
+        # Set by ContentHashMiddleware in incremental mode
+        unchanged = response.meta.get("content_unchanged", False)
+
         for paragraph in response.css("p.paragraf"):
             quote = paragraph.css("span.slogan::text").get()
 
-            if quote:
+            if quote and not unchanged:
                 yield {
                     "cat": cat,
                     "subcat": subcat,
@@ -157,10 +175,9 @@ class AdvertisingSlogansSpider(scrapy.Spider):
             next_pages = paragraph.css('a::attr("href")').getall()
 
             for page in next_pages:
-                if page not in visited:
-                    yield response.follow(
-                        page,
-                        self.getQuote,
-                        cb_kwargs={"cat": cat, "subcat": subcat, "visited": visited},
-                    )
+                request = self._follow(
+                    response, page, self.getQuote, {"cat": cat, "subcat": subcat}
+                )
+                if request:
+                    yield request
         return
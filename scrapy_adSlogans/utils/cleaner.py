@@ -1,48 +1,150 @@
 import csv
+import heapq
 import json
+import os
+import tempfile
+import time
 
+try:
+    import orjson
 
-def read_jsonl_to_csv(input_path: str, output_path: str) -> None:
+    loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    loads = json.loads
+    JSONDecodeError = json.JSONDecodeError
+
+FIELDNAMES = ["Category", "Subcategory", "Company", "Slogan"]
+
+
+def _text(value) -> str:
+    """Converts a field to text without newlines or tabs. None becomes ""."""
+    if value is None:
+        return ""
+    return str(value).replace("\n", "").replace("\t", "")
+
+
+def normalize_record(res: dict):
+    """
+    Normalizes one scraped slogan into a row.
+
+    The company name has its whitespace collapsed, every field is stripped and
+    newlines and tabs are removed.
+
+    Args:
+        res (dict): A scraped item with company, quote, cat and subcat.
+
+    Returns:
+        list: The row in FIELDNAMES order, or None if it has no company or quote.
+    """
+    company = " ".join(_text(res.get("company")).split())
+    quote = _text(res.get("quote")).strip()
+
+    if not (company and quote):
+        return None
+
+    return [
+        _text(res.get("cat")).strip(),
+        _text(res.get("subcat")).strip(),
+        company,
+        quote,
+    ]
+
+
+def parse_line(line: str):
+    """
+    Parses one JSONL line into a CSV row.
+
+    Args:
+        line (str): A line of the JSONL file.
+
+    Returns:
+        list: The row in FIELDNAMES order, or None if the line is not valid JSON
+        or has no company or quote.
+    """
+    try:
+        res = loads(line)
+    except JSONDecodeError:
+        return None
+
+    return normalize_record(res)
+
+
+def _category(row: list) -> str:
+    return row[0]
+
+
+def _spill(rows: list, folder: str, index: int) -> str:
+    """Sorts rows by Category and writes them to a run file."""
+    path = os.path.join(folder, f"run-{index:05d}.csv")
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        csv.writer(file).writerows(sorted(rows, key=_category))
+    return path
+
+
+def read_jsonl_to_csv(
+    input_path: str, output_path: str, run_size: int = 100_000
+) -> None:
     """
     Reads data from a JSON Lines (JSONL) file and converts it into a CSV file.
 
     Args:
         input_path (str): Path to the JSONL file.
         output_path (str): Path where the CSV file will be saved.
+        run_size (int): Rows held in memory at a time while sorting.
 
     This function processes each line of the JSONL file, extracting relevant fields
     such as company, quote, category, and subcategory. It then writes these
     processed data into a CSV file with headers: Category, Subcategory,
     Company, Slogan. The resulting data is sorted by Category before being saved.
+
+    The file is streamed line by line. Every run_size rows are sorted and
+    spilled to a temporary run file, and the runs are merged into the output,
+    so memory stays bounded however large the input is. The sort is stable:
+    rows of the same Category keep their input order. orjson is used to decode
+    lines when it is installed.
     """
-    lst = []
-    with open(input_path, "r", encoding="utf-8") as file:
-        line = file.readline()
-        with open(output_path, "w", encoding="utf-8", newline='') as newFile:
-            while line != "":
-                # Remove any \n or \t characters
-                line = line.replace('\\n', '').replace('\\t', '')
-
-                try:
-                    res = json.loads(line)
-                except json.JSONDecodeError:
-                    line = file.readline()
+    start = time.perf_counter()
+    lines = 0
+    kept = 0
+
+    with tempfile.TemporaryDirectory() as folder:
+        runs = []
+        rows = []
+
+        with open(input_path, "r", encoding="utf-8") as file:
+            for line in file:
+                lines += 1
+                row = parse_line(line)
+                if row is None:
                     continue
 
-                company = " ".join(str(res["company"]).strip().split())
-                quote = str(res.get("quote", "")).strip()
+                rows.append(row)
+                kept += 1
+                if len(rows) >= run_size:
+                    runs.append(_spill(rows, folder, len(runs)))
+                    rows = []
 
-                if company and (quote or quote.strip()):
-                    lst.append({
-                        "Category": str(res.get("cat", "")).strip(),
-                        "Subcategory": str(res.get("subcat", "")).strip(),
-                        "Company": company,
-                        "Slogan": quote
-                    })
+        # The last run never needs to go through disk
+        rows.sort(key=_category)
 
-                line = file.readline()
+        files = [open(path, "r", encoding="utf-8", newline="") for path in runs]
+        try:
+            with open(output_path, "w", encoding="utf-8", newline="") as newFile:
+                writer = csv.writer(newFile)
+                writer.writerow(FIELDNAMES)
+                writer.writerows(
+                    heapq.merge(
+                        *(csv.reader(run) for run in files), rows, key=_category
+                    )
+                )
+        finally:
+            for run in files:
+                run.close()
 
-    fieldnames = ['Category', 'Subcategory', 'Company', 'Slogan']
-    writer = csv.DictWriter(newFile, fieldnames=fieldnames)
-    writer.writeheader()
-    writer.writerows(sorted(lst, key=lambda d: d['Category']))
\ No newline at end of file
+    seconds = time.perf_counter() - start
+    print(
+        f"{lines} lines ({kept} rows, {len(runs) + 1} runs) in {seconds:.2f}s: "
+        f"{lines / seconds if seconds else 0:,.0f} lines/s "
+        f"({loads.__module__.split('.')[0]})"
+    )
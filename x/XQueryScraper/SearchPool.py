@@ -0,0 +1,184 @@
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from queryScraper import ProfileCache, XScraper, SeenIndex
+
+
+class SearchPool:
+    """
+    Runs X search queries concurrently on several logged-in browsers.
+
+    Only one browser goes through the login flow. Its session cookies are
+    exported to cookies_path and reused by every other worker (and by later
+    runs while the session stays valid; once it expires, the first worker logs
+    in again and re-exports them). Queries are taken from a shared queue,
+    so a slow query never holds up the others, and all workers share one
+    SeenIndex so a tweet returned by several queries is only stored once,
+    and one ProfileCache so each author's poster details are read only once.
+
+    To run against a local stand-in page, pass a subclass of XScraper that
+    overrides HOME_URL / SEARCH_URL as scraper_cls.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        workers: int = 4,
+        cookies_path: str = "./x_session.json",
+        seen_path: str = None,
+        scraper_cls=XScraper,
+        **scraper_kwargs,
+    ) -> None:
+        """
+        Initializes the pool. Browsers are only started by start().
+
+        :param username: X/Twitter username
+        :param password: X/Twitter password
+        :param workers: Number of browsers to run concurrently
+        :param cookies_path: JSON file the shared session cookies are stored in
+        :param seen_path: File the shared tweet id index is persisted to
+        :param scraper_cls: XScraper or a subclass of it
+        :param scraper_kwargs: Extra keyword arguments passed to every scraper
+        """
+        self.username = username
+        self.password = password
+        self.workers = workers
+        self.cookies_path = cookies_path
+        self.scraper_cls = scraper_cls
+        self.scraper_kwargs = scraper_kwargs
+
+        self.seen = SeenIndex(seen_path)
+        self.profiles = ProfileCache()
+        self.scrapers = []
+        self.data = []
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        Starts the browsers, logging in at most once, and only when there are no
+        saved cookies or they no longer give a logged-in session.
+        """
+        cookies = None
+        if self.cookies_path and os.path.exists(self.cookies_path):
+            with open(self.cookies_path, "r", encoding="utf-8") as file:
+                cookies = json.load(file)
+
+        # The first browser checks the saved session, and logs in if there is
+        # none or it has expired, before the others reuse it
+        first = self._newScraper(cookies)
+        if not first.loggedIn:
+            first.close()
+            raise RuntimeError("Could not log in to X")
+        if not first.restored:
+            cookies = first.export_cookies(self.cookies_path)
+        self.scrapers.append(first)
+
+        missing = self.workers - len(self.scrapers)
+        with ThreadPoolExecutor(max_workers=max(missing, 1)) as executor:
+            self.scrapers.extend(executor.map(self._newScraper, [cookies] * missing))
+
+    def _newScraper(self, cookies: list) -> XScraper:
+        """
+        Starts one scraper sharing the pool's tweet index.
+
+        :param cookies: Session cookies to restore, or None to log in
+        :return: The new scraper
+        """
+        return self.scraper_cls(
+            self.username,
+            self.password,
+            cookies=cookies,
+            seen=self.seen,
+            profiles=self.profiles,
+            **self.scraper_kwargs,
+        )
+
+    def run(self, queries: list, tweetCount: int, **search_kwargs) -> list:
+        """
+        Scrapes every query, spreading them across the workers.
+
+        :param queries: Search query strings
+        :param tweetCount: Amount of posts to be scraped per query
+        :param search_kwargs: Extra keyword arguments passed to scrapeSearch
+        :return: The merged, deduplicated tweets of all queries
+        """
+        if not self.scrapers:
+            self.start()
+
+        pending = queue.Queue()
+        for query in queries:
+            pending.put(query)
+
+        threads = [
+            threading.Thread(
+                target=self._work,
+                args=(index, scraper, pending, tweetCount, search_kwargs),
+            )
+            for index, scraper in enumerate(self.scrapers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for index, stats in self.metrics.items():
+            print(f"worker {index}: {stats}")
+
+        return self.data
+
+    def _work(
+        self,
+        index: int,
+        scraper: XScraper,
+        pending: queue.Queue,
+        tweetCount: int,
+        search_kwargs: dict,
+    ) -> None:
+        """
+        Worker loop: scrapes queries from the queue until it is empty.
+        """
+        stats = self.metrics.setdefault(
+            index, {"queries": 0, "tweets": 0, "seconds": 0.0, "tweets_per_sec": 0.0}
+        )
+
+        while True:
+            try:
+                query = pending.get_nowait()
+            except queue.Empty:
+                break
+
+            start = time.perf_counter()
+            try:
+                scraper.scrapeSearch(query, tweetCount, **search_kwargs)
+            except Exception as e:
+                print(f"worker {index} failed on {query!r}: {e}")
+
+            with self.lock:
+                self.data.extend(scraper.data)
+                stats["tweets"] += len(scraper.data)
+                scraper.data = []
+
+            stats["queries"] += 1
+            stats["seconds"] += time.perf_counter() - start
+            stats["tweets_per_sec"] = round(stats["tweets"] / stats["seconds"], 3)
+
+    def save_to_csv(self) -> None:
+        """
+        Saves the merged tweets of all workers to one CSV file.
+        """
+        if self.scrapers:
+            self.scrapers[0].save_to_csv(self.data)
+
+    def close(self) -> None:
+        """
+        Closes every browser in the pool.
+        """
+        for scraper in self.scrapers:
+            scraper.close()
+        self.scrapers = []
@@ -1,11 +1,170 @@
-from time import sleep
+import re
+import threading
+import time
 from selenium.common.exceptions import (
     NoSuchElementException,
     StaleElementReferenceException,
+    TimeoutException,
 )
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.wait import WebDriverWait
+
+# Serializes every tweet card currently in the DOM in a single browser round
+# trip. Uses the same XPath expressions as the per-field path in Tweet below.
+EXTRACT_TWEETS_JS = """
+function one(node, xpath) {
+    return document.evaluate(
+        xpath, node, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+}
+
+function all(node, xpath) {
+    const res = document.evaluate(
+        xpath, node, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+    );
+    const out = [];
+    for (let i = 0; i < res.snapshotLength; i++) {
+        out.push(res.snapshotItem(i));
+    }
+    return out;
+}
+
+function text(el) {
+    return el ? el.innerText.trim() : null;
+}
+
+function count(card, xpath) {
+    return text(one(card, xpath)) || "0";
+}
+
+const exclude = new Set(arguments[0] || []);
+const cards = document.querySelectorAll('article[data-testid="tweet"]');
+
+return Array.from(cards).map((card) => {
+    const link = one(card, ".//a[contains(@href, '/status/')]");
+    const match = link ? link.href.match(/[/]status[/]([0-9]+)/) : null;
+    const tweetId = match ? match[1] : null;
+    if (tweetId !== null && exclude.has(tweetId)) {
+        return {card: card, tweet_id: tweetId, skipped: true};
+    }
+
+    const time = one(card, ".//time");
+    const avatar = one(card, './/div[@data-testid="Tweet-User-Avatar"]//img');
+
+    return {
+        card: card,
+        tweet_id: tweetId,
+        user: text(one(card, './/div[@data-testid="User-Name"]//span')),
+        handle: text(one(card, './/span[contains(text(), "@")]')),
+        date_time: time ? time.getAttribute("datetime") : null,
+        verified: one(
+            card, './/*[local-name()="svg" and @data-testid="icon-verified"]'
+        ) !== null,
+        content: all(
+            card,
+            '(.//div[@data-testid="tweetText"])[1]/span | (.//div[@data-testid="tweetText"])[1]/a'
+        ).map((el) => el.innerText).join(""),
+        reply_cnt: count(card, './/button[@data-testid="reply"]//span'),
+        retweet_cnt: count(card, './/button[@data-testid="retweet"]//span'),
+        like_cnt: count(card, './/button[@data-testid="like"]//span'),
+        analytics_cnt: count(card, './/a[contains(@href, "/analytics")]//span'),
+        tags: all(card, './/a[contains(@href, "src=hashtag_click")]').map(text),
+        mentions: all(
+            card, '(.//div[@data-testid="tweetText"])[1]//a[contains(text(), "@")]'
+        ).map(text),
+        emojis: all(
+            card, '(.//div[@data-testid="tweetText"])[1]/img[contains(@src, "emoji")]'
+        ).map((img) => img.getAttribute("alt")),
+        profile_img: avatar ? avatar.getAttribute("src") : "",
+        tweet_link: link ? link.href : "",
+    };
+});
+"""
+
+
+def extract_tweets(driver: WebDriver, exclude=()) -> list:
+    """Serialize every visible tweet card with one injected script.
+
+    Args:
+        driver: A Selenium WebDriver instance showing a timeline or search page.
+        exclude: (Optional) Tweet ids that are already known. Their cards are
+            returned as ``{"card": ..., "tweet_id": ..., "skipped": True}`` without
+            extracting any other field.
+
+    Returns:
+        A list of plain dicts, one per article[data-testid="tweet"] in document
+        order, ready to be passed to Tweet as ``payload``. Each dict also carries
+        the card's WebElement under "card".
+    """
+    return driver.execute_script(EXTRACT_TWEETS_JS, list(exclude))
+
+
+def card_tweet_id(card: WebElement) -> str:
+    """Read the tweet id of a card with a single lookup.
+
+    Args:
+        card: The tweet's article element.
+
+    Returns:
+        The numeric tweet id from the card's status link, or None if it has none.
+    """
+    try:
+        href = card.find_element(
+            "xpath", ".//a[contains(@href, '/status/')]"
+        ).get_attribute("href")
+    except NoSuchElementException:
+        return None
+
+    match = re.search(r"/status/(\d+)", href or "")
+    return match.group(1) if match else None
+
+
+class ProfileCache:
+    """Poster details (user_id, following, followers) per author handle.
+
+    Lets Tweet hover each author at most once per ttl seconds instead of once
+    per tweet. Safe to share between scrapers running in parallel.
+
+    Attributes:
+        ttl: Seconds an entry stays valid.
+        hits: Lookups answered from the cache.
+        misses: Lookups that required a hover.
+    """
+
+    def __init__(self, ttl: float = 3600) -> None:
+        self.ttl = ttl
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, handle: str):
+        """Return the cached (user_id, following, followers) of a handle, or None."""
+        with self.lock:
+            entry = self.entries.get(handle)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def put(self, handle: str, details: tuple) -> None:
+        with self.lock:
+            self.entries[handle] = (details, time.monotonic())
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "authors": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate(), 3),
+        }
 
 
 class Tweet:
@@ -47,6 +206,9 @@ class Tweet:
         driver: WebDriver,
         actions: ActionChains,
         scrape_poster_details=False,
+        payload: dict = None,
+        profile_cache: ProfileCache = None,
+        hover_timeout: float = 5,
     ) -> None:
         """Initialize a Tweet instance with parsed data.
 
@@ -54,6 +216,13 @@ class Tweet:
             driver: A Selenium WebDriver instance used for element navigation.
             el: An Element object representing the tweet's user profile section.
             hover_card: (Optional) The hover card element if interaction attempts were made. Default is None.
+            payload: (Optional) A dict produced by extract_tweets or
+                timeline.parse_search_timeline. When given, the tweet fields are read
+                from it instead of being queried one by one.
+            profile_cache: (Optional) A ProfileCache. With scrape_poster_details, the
+                author is only hovered if the cache has no fresh entry for its handle.
+            hover_timeout: Seconds to wait for each part of the hover card before
+                giving up on the poster details.
 
         Returns:
             None; sets attributes based on parsed information.
@@ -65,6 +234,165 @@ class Tweet:
         self.error = False
         self.tweet = None
 
+        if payload is not None:
+            self.card = payload.get("card", card)
+            self._from_payload(payload)
+        else:
+            self._from_card(card)
+
+        if self.error:
+            return
+
+        self.following_cnt = "0"
+        self.followers_cnt = "0"
+        self.user_id = None
+
+        if scrape_poster_details:
+            details = profile_cache.get(self.handle) if profile_cache else None
+            if details is None:
+                details = self._hover_poster_details(driver, actions, hover_timeout)
+                if details is not None and profile_cache is not None:
+                    profile_cache.put(self.handle, details)
+
+            # A hover card that never rendered leaves the defaults set above
+            if details is not None:
+                self.user_id, self.following_cnt, self.followers_cnt = details
+
+        self.tweet = (
+            self.user,
+            self.handle,
+            self.date_time,
+            self.verified,
+            self.content,
+            self.reply_cnt,
+            self.retweet_cnt,
+            self.like_cnt,
+            self.analytics_cnt,
+            self.tags,
+            self.mentions,
+            self.emojis,
+            self.profile_img,
+            self.tweet_link,
+            self.tweet_id,
+            self.user_id,
+            self.following_cnt,
+            self.followers_cnt,
+        )
+
+    def _hover_poster_details(
+        self, driver: WebDriver, actions: ActionChains, timeout: float, attempts=2
+    ):
+        """Hover the author's name and read the hover card.
+
+        Every element is waited for with a bounded explicit wait, so a hover card
+        that never renders costs at most attempts * timeout seconds.
+
+        Returns:
+            (user_id, following_cnt, followers_cnt), or None if the card could not
+            be read.
+        """
+        wait = WebDriverWait(
+            driver,
+            timeout,
+            poll_frequency=0.1,
+            ignored_exceptions=(NoSuchElementException,),
+        )
+
+        for _ in range(attempts):
+            try:
+                el_name = self.card.find_element(
+                    "xpath", './/div[@data-testid="User-Name"]//span'
+                )
+                actions.move_to_element(el_name).perform()
+
+                hover_card = wait.until(
+                    lambda d: d.find_element(
+                        "xpath", '//div[@data-testid="hoverCardParent"]'
+                    )
+                )
+                raw_user_id = wait.until(
+                    lambda _: hover_card.find_element(
+                        "xpath",
+                        '(.//div[contains(@data-testid, "-follow")]) | (.//div[contains(@data-testid, "-unfollow")])',
+                    )
+                ).get_attribute("data-testid")
+                following = wait.until(
+                    lambda _: hover_card.find_element(
+                        "xpath", './/a[contains(@href, "/following")]//span'
+                    )
+                ).text
+                followers = wait.until(
+                    lambda _: hover_card.find_element(
+                        "xpath", './/a[contains(@href, "/verified_followers")]//span'
+                    )
+                ).text
+
+                user_id = str(raw_user_id.split("-")[0]) if raw_user_id else None
+                return user_id, following or "0", followers or "0"
+            except (
+                NoSuchElementException,
+                StaleElementReferenceException,
+                TimeoutException,
+            ):
+                continue
+            finally:
+                actions.reset_actions()
+
+        return None
+
+    def _from_payload(self, payload: dict) -> None:
+        """Populate the tweet attributes from an extract_tweets payload.
+
+        Args:
+            payload: The serialized card as returned by extract_tweets.
+        """
+        self.user = payload.get("user") or "skip"
+        self.handle = payload.get("handle") or "skip"
+        self.date_time = payload.get("date_time")
+
+        if self.date_time is None:
+            self.is_ad = True
+            self.date_time = "skip"
+        else:
+            self.is_ad = False
+
+        if "skip" in (self.user, self.handle, self.date_time):
+            self.error = True
+            return
+
+        self.verified = bool(payload.get("verified"))
+        self.content = payload.get("content") or ""
+
+        def count(key):
+            value = payload.get(key)
+            return "0" if value is None or value == "" else value
+
+        self.reply_cnt = count("reply_cnt")
+        self.retweet_cnt = count("retweet_cnt")
+        self.like_cnt = count("like_cnt")
+        self.analytics_cnt = count("analytics_cnt")
+        self.tags = payload.get("tags") or []
+        self.mentions = payload.get("mentions") or []
+        self.emojis = [
+            emoji.encode("unicode-escape").decode("ASCII")
+            for emoji in payload.get("emojis") or []
+            if emoji
+        ]
+        self.profile_img = payload.get("profile_img") or ""
+        self.tweet_link = payload.get("tweet_link") or ""
+        if payload.get("tweet_id"):
+            self.tweet_id = str(payload["tweet_id"])
+        elif self.tweet_link:
+            self.tweet_id = str(self.tweet_link.split("/")[-1])
+        else:
+            self.tweet_id = ""
+
+    def _from_card(self, card: WebElement) -> None:
+        """Populate the tweet attributes by querying the card field by field.
+
+        Args:
+            card: The tweet's article element.
+        """
         try:
             self.user = card.find_element(
                 "xpath", './/div[@data-testid="User-Name"]//span'
@@ -203,121 +531,3 @@ class Tweet:
         except NoSuchElementException:
             self.tweet_link = ""
             self.tweet_id = ""
-
-        self.following_cnt = "0"
-        self.followers_cnt = "0"
-        self.user_id = None
-
-        if scrape_poster_details:
-            el_name = card.find_element(
-                "xpath", './/div[@data-testid="User-Name"]//span'
-            )
-
-            ext_hover_card = False
-            ext_user_id = False
-            ext_following = False
-            ext_followers = False
-            hover_attempt = 0
-
-            while (
-                not ext_hover_card
-                or not ext_user_id
-                or not ext_following
-                or not ext_followers
-            ):
-                try:
-                    actions.move_to_element(el_name).perform()
-
-                    hover_card = driver.find_element(
-                        "xpath", '//div[@data-testid="hoverCardParent"]'
-                    )
-
-                    ext_hover_card = True
-
-                    while not ext_user_id:
-                        try:
-                            raw_user_id = hover_card.find_element(
-                                "xpath",
-                                '(.//div[contains(@data-testid, "-follow")]) | (.//div[contains(@data-testid, "-unfollow")])',
-                            ).get_attribute("data-testid")
-
-                            if raw_user_id == "":
-                                self.user_id = None
-                            else:
-                                self.user_id = str(raw_user_id.split("-")[0])
-
-                            ext_user_id = True
-                        except NoSuchElementException:
-                            continue
-                        except StaleElementReferenceException:
-                            self.error = True
-                            return
-
-                    while not ext_following:
-                        try:
-                            self.following_cnt = hover_card.find_element(
-                                "xpath", './/a[contains(@href, "/following")]//span'
-                            ).text
-
-                            if self.following_cnt == "":
-                                self.following_cnt = "0"
-
-                            ext_following = True
-                        except NoSuchElementException:
-                            continue
-                        except StaleElementReferenceException:
-                            self.error = True
-                            return
-
-                    while not ext_followers:
-                        try:
-                            self.followers_cnt = hover_card.find_element(
-                                "xpath",
-                                './/a[contains(@href, "/verified_followers")]//span',
-                            ).text
-
-                            if self.followers_cnt == "":
-                                self.followers_cnt = "0"
-
-                            ext_followers = True
-                        except NoSuchElementException:
-                            continue
-                        except StaleElementReferenceException:
-                            self.error = True
-                            return
-                except NoSuchElementException:
-                    if hover_attempt == 3:
-                        self.error
-                        return
-                    hover_attempt += 1
-                    sleep(0.5)
-                    continue
-                except StaleElementReferenceException:
-                    self.error = True
-                    return
-
-            if ext_hover_card and ext_following and ext_followers:
-                actions.reset_actions()
-
-        self.tweet = (
-            self.user,
-            self.handle,
-            self.date_time,
-            self.verified,
-            self.content,
-            self.reply_cnt,
-            self.retweet_cnt,
-            self.like_cnt,
-            self.analytics_cnt,
-            self.tags,
-            self.mentions,
-            self.emojis,
-            self.profile_img,
-            self.tweet_link,
-            self.tweet_id,
-            self.user_id,
-            self.following_cnt,
-            self.followers_cnt,
-        )
-
-        pass
@@ -0,0 +1,100 @@
+"""Benchmark of Xcleaner against the previous row-by-row implementation.
+
+Generates a synthetic tweet CSV shaped like XScraper.save_to_csv output, cleans
+it with both implementations and prints their run times.
+
+Usage:
+    python bench_cleaner.py --rows 200000 --chunksize 50000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import tempfile
+import time
+
+import pandas as pd
+
+from cleaner import Xcleaner
+
+
+def legacy_xcleaner(input_file, output_file):
+    """The previous Xcleaner: one iloc write per cell, K/M replaced by zeros."""
+    df = pd.read_csv(input_file, encoding="utf-8")
+
+    for i in range(len(df[df.columns[3]].values)):
+        try:
+            df.iloc[i, 3] = df.iloc[i, 3].replace("\n", "")
+            df.iloc[i, 3] = re.sub(r"[^\x00-\x7F]+", "", df.iloc[i, 3])
+            df.iloc[i, 4] = df.iloc[i, 4].replace("K", "000")
+            df.iloc[i, 4] = df.iloc[i, 4].replace("M", "000000")
+            df.iloc[i, 5] = df.iloc[i, 5].replace("K", "000")
+            df.iloc[i, 5] = df.iloc[i, 5].replace("M", "000000")
+            df.iloc[i, 6] = df.iloc[i, 6].replace("K", "000")
+            df.iloc[i, 6] = df.iloc[i, 6].replace("M", "000000")
+        except Exception as e:
+            print(f"Error processing row {i}: {e}")
+
+    df = df.drop_duplicates()
+    df.to_csv(output_file, encoding="utf-8", index=False)
+
+
+def make_dataset(path, rows, seed=0):
+    """Write a CSV of rows synthetic tweets, about 1% of them duplicates."""
+    rng = random.Random(seed)
+
+    def count():
+        return rng.choice(["", "7", "42", "999", "1.2K", "35K", "1,024", "4.5M", "1B"])
+
+    data = []
+    for i in range(rows):
+        if data and rng.random() < 0.01:
+            data.append(data[rng.randrange(len(data))])
+            continue
+        data.append(
+            {
+                "Name": f"user {i % 5000}",
+                "Handle": f"@user{i % 5000}",
+                "Timestamp": f"2024-01-01T00:{i % 60:02d}:00.000Z",
+                "Content": f"tweet {i}\nwith a newline ✨ and émojis 🚀",
+                "Retweets": count(),
+                "Likes": count(),
+                "Views": count(),
+                "Tweet Link": f"https://x.com/user/status/{i}",
+            }
+        )
+    pd.DataFrame(data).to_csv(path, index=False, encoding="utf-8")
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Xcleaner.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, "tweets.csv")
+        make_dataset(source, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(source) / 1e6:.1f} MB")
+
+        seconds = timed(
+            Xcleaner, source, os.path.join(folder, "new.csv"), args.chunksize
+        )
+        print(f"Xcleaner: {seconds:.2f}s ({args.rows / seconds:,.0f} rows/s)")
+
+        if not args.skip_legacy:
+            # The legacy loop prints an error for every row with an empty count
+            with contextlib.redirect_stdout(io.StringIO()):
+                legacy = timed(legacy_xcleaner, source, os.path.join(folder, "old.csv"))
+            print(f"legacy:   {legacy:.2f}s ({args.rows / legacy:,.0f} rows/s)")
+            print(f"speedup:  {legacy / seconds:.1f}x")
@@ -1,55 +1,99 @@
 import pandas as pd
-import re
 
 """A utility script for cleaning and processing CSV files from social media data sources.
 
 This script provides functions to clean text-based data, handling common issues like
-newlines, non-ASCII characters, and large number representations (K, M).
+newlines, non-ASCII characters, and large number representations (K, M, B).
 
 Functions:
+    parse_counts: Converts counts like "1.2K" into integers.
+    clean_chunk: Cleans one DataFrame chunk of tweets.
     Xcleaner: Processes a CSV file by removing unwanted characters and formatting.
     redditCleaner: Specializes in cleaning Reddit posts from JSON-like structures.
 
 """
 
 
-def Xcleaner(input_file, output_file):
+MULTIPLIERS = {"": 1, "K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+
+
+def parse_counts(series):
+    """Convert abbreviated counts such as "1.2K", "3M" or "1,024" to integers.
+
+    Args:
+        series (pd.Series): Counts as scraped from the page.
+
+    Returns:
+        pd.Series: int64 counts. Empty or unparseable values become 0.
+    """
+    text = (
+        series.astype("string")
+        .str.strip()
+        .str.replace(",", "", regex=False)
+        .str.upper()
+    )
+    parts = text.str.extract(r"^(\d+(?:\.\d+)?)([KMB]?)$")
+    numbers = pd.to_numeric(parts[0], errors="coerce")
+    multipliers = parts[1].map(MULTIPLIERS).astype("float64")
+    return (numbers * multipliers).round().fillna(0).astype("int64")
+
+
+def clean_chunk(df):
+    """Clean one chunk of tweets in place and return it.
+
+    Column 3 (the tweet text) loses newlines and non-ASCII characters, and
+    columns 4 to 6 (retweets, likes, views) are parsed into integer counts.
+    """
+    text = df.columns[3]
+    df[text] = (
+        df[text]
+        .fillna("")
+        .astype(str)
+        .str.replace(r"[\r\n]+", "", regex=True)
+        .str.replace(r"[^\x00-\x7F]+", "", regex=True)
+    )
+    for column in df.columns[4:7]:
+        df[column] = parse_counts(df[column])
+    return df
+
+
+def Xcleaner(input_file, output_file, chunksize=100_000):
     """Process a CSV file to remove unwanted characters and format data properly.
 
     Args:
         input_file (str): Path to the input CSV file.
         output_file (str): Path where cleaned data will be saved.
+        chunksize (int): Rows read, cleaned and written at a time, so the memory
+            used does not depend on the size of the input.
 
     Notes:
-        The function processes specific columns by removing newlines, non-ASCII chars,
-        and replacing 'K' or 'M' with zeros. It also drops duplicates before saving.
-
-    Raises:
-        Exception: If any required column values cannot be processed.
+        The function processes specific columns by removing newlines and non-ASCII
+        chars, and parsing counts with K, M or B suffixes into integers. Duplicate
+        rows are dropped across the whole file by keeping a 64-bit hash per row.
     """
 
-    df = pd.read_csv(input_file, encoding="utf-8")
+    seen = set()
+    columns = None
 
-    # Loop over each item in the specified column (column 3)
-    for i in range(len(df[df.columns[3]].values)):
-        try:
-            df.iloc[i, 3] = df.iloc[i, 3].replace("\n", "")
-            df.iloc[i, 3] = re.sub(r"[^\x00-\x7F]+", "", df.iloc[i, 3])
-            df.iloc[i, 4] = df.iloc[i, 4].replace("K", "000")
-            df.iloc[i, 4] = df.iloc[i, 4].replace("M", "000000")
-            df.iloc[i, 5] = df.iloc[i, 5].replace("K", "000")
-            df.iloc[i, 5] = df.iloc[i, 5].replace("M", "000000")
-            df.iloc[i, 6] = df.iloc[i, 6].replace("K", "000")
-            df.iloc[i, 6] = df.iloc[i, 6].replace("M", "000000")
+    for index, chunk in enumerate(
+        pd.read_csv(input_file, encoding="utf-8", dtype=str, chunksize=chunksize)
+    ):
+        chunk = clean_chunk(chunk)
 
-        except Exception as e:
-            print(f"Error processing row {i}: {e}")
+        # Drop rows already written, in this chunk or an earlier one
+        hashes = pd.util.hash_pandas_object(chunk, index=False).tolist()
+        new = [not (h in seen or seen.add(h)) for h in hashes]
 
-    # Save the cleaned DataFrame to a new CSV file
-    df = df.drop_duplicates()
-    df.to_csv(output_file, encoding="utf-8", index=False)
+        chunk[new].to_csv(
+            output_file,
+            encoding="utf-8",
+            index=False,
+            mode="w" if index == 0 else "a",
+            header=index == 0,
+        )
+        columns = chunk.columns.values
 
     # Print the column names
-    print(df.columns.values)
+    print(columns)
 
     return
@@ -1,5 +1,7 @@
 from datetime import datetime
+import json
 import os
+import sys
 import time
 import pandas as pd
 from selenium import webdriver
@@ -10,23 +12,65 @@ from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import (
     NoSuchElementException,
+    TimeoutException,
 )
 
-from Scroller import Scroller
-from Tweet import Tweet
+from timeline import TimelineCapture, parse_search_timeline
+from Tweet import ProfileCache, Tweet, card_tweet_id, extract_tweets
+
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common")
+)
+from LeanBrowser import LeanBrowser  # noqa: E402
+from Scroller import Scroller  # noqa: E402
+from SeenIndex import SeenIndex  # noqa: E402
+
+TWEET_SELECTOR = 'article[data-testid="tweet"]'
 
 
 class XScraper:
     """
     A web scraper for extracting tweets from X (formerly Twitter).
+
+    HOME_URL and SEARCH_URL can be overridden (e.g. in a subclass) to point the
+    scraper at a local stand-in page.
     """
 
-    def __init__(self, username: str, password: str) -> None:
+    HOME_URL = "https://twitter.com/"
+    LOGIN_URL = "https://twitter.com/i/flow/login"
+    SEARCH_URL = "https://twitter.com/search?q={query}&src=typed_query"
+    # Only rendered for a logged-in session
+    LOGGED_IN_SELECTOR = '[data-testid="SideNav_AccountSwitcher_Button"]'
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        capture_network: bool = False,
+        seen_path: str = None,
+        cookies: list = None,
+        seen: SeenIndex = None,
+        lean: LeanBrowser = None,
+        profiles: ProfileCache = None,
+    ) -> None:
         """
         Initializes the XScraper with login credentials and sets up the Selenium WebDriver.
 
         :param username: X/Twitter username
         :param password: X/Twitter password
+        :param capture_network: Enable Chrome's performance log so that
+            scrapeSearch(graphql=True) can read the SearchTimeline responses
+        :param seen_path: File the tweet id index is persisted to. Tweets saved by
+            a previous run with the same file are skipped
+        :param cookies: Session cookies exported by export_cookies. When given,
+            the session is restored from them instead of logging in again, unless
+            they no longer give a logged-in session. self.restored tells which
+        :param seen: An existing SeenIndex to share with other scrapers. Takes
+            precedence over seen_path
+        :param lean: A LeanBrowser profile: run headless without images, media,
+            fonts and trackers, and measure requests and bytes per search
+        :param profiles: An existing ProfileCache to share with other scrapers, so
+            each author's poster details are only read once
         """
         self.username = username
         self.password = password
@@ -34,16 +78,30 @@ class XScraper:
         self.options = ChromeOptions()
         self.options.add_argument("--start-maximized")
         self.options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        self.capture_network = capture_network
+        if capture_network:
+            self.options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        self.lean = lean
+        if lean:
+            lean.chrome_options(self.options)
 
         self.driver = webdriver.Chrome(options=self.options)
-        self.scroller = Scroller(self.driver)
+        if lean:
+            lean.attach(self.driver)
+        self.scroller = Scroller(self.driver, card_selector=TWEET_SELECTOR)
         self.actions = ActionChains(self.driver)
 
         self.data = []
         self.posts = []
-        self.postsId = set()
+        self.postsId = seen if seen is not None else SeenIndex(seen_path)
+        self.profiles = profiles if profiles is not None else ProfileCache()
+        self.poster_details = False
 
-        self.loggedIn = self._logIn()
+        self.restored = bool(cookies) and self._restoreSession(cookies)
+        if cookies and not self.restored:
+            print("Saved session is no longer logged in, logging in again")
+            self.driver.delete_all_cookies()
+        self.loggedIn = self.restored or self._logIn()
 
     def _logIn(self) -> bool:
         """
@@ -52,8 +110,7 @@ class XScraper:
         :return: True if login is successful, False otherwise
         """
         try:
-            url = "https://twitter.com/i/flow/login"
-            self.driver.get(url)
+            self.driver.get(self.LOGIN_URL)
 
             username_field = WebDriverWait(self.driver, 20).until(
                 EC.visibility_of_element_located(
@@ -76,70 +133,253 @@ class XScraper:
         except Exception:
             return False
 
-    def scrapeSearch(self, query: str, tweetCount: int) -> None:
+    def _restoreSession(self, cookies: list) -> bool:
+        """
+        Restores a logged-in session from exported cookies instead of logging in.
+
+        :param cookies: Cookies as returned by export_cookies
+        :return: True if the restored session is logged in, False otherwise
+        """
+        try:
+            self.driver.get(self.HOME_URL)
+            for cookie in cookies:
+                self.driver.add_cookie(cookie)
+            self.driver.refresh()
+            return self._isLoggedIn()
+        except Exception as e:
+            print(e)
+            return False
+
+    def _isLoggedIn(self, timeout: int = 10) -> bool:
+        """
+        Checks that the current session is logged in, e.g. that restored cookies
+        have not expired.
+
+        :param timeout: Seconds to wait for the logged-in page to render
+        :return: True if the session is logged in, False otherwise
+        """
+        if self.driver.get_cookie("auth_token") is None:
+            return False
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, self.LOGGED_IN_SELECTOR)
+                )
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    def export_cookies(self, path: str = None) -> list:
+        """
+        Exports the session cookies so other scrapers can reuse this login.
+
+        :param path: Optional JSON file to write the cookies to
+        :return: The cookies of the current session
+        """
+        cookies = self.driver.get_cookies()
+        if path:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(cookies, file)
+        return cookies
+
+    def close(self) -> None:
+        """
+        Closes the browser.
+        """
+        self.driver.quit()
+
+    def scrapeSearch(
+        self,
+        query: str,
+        tweetCount: int,
+        batch: bool = True,
+        graphql: bool = False,
+        poster_details: bool = False,
+    ) -> None:
         """
         Searches for tweets containing the specified query and scrapes the results.
 
         :param query: Search query string
         :param tweetCount: Amount of posts to be scraped
+        :param batch: Serialize all visible cards with one injected script per loop
+            instead of querying every field of every card separately
+        :param graphql: Read tweets from the SearchTimeline GraphQL responses
+            instead of the rendered DOM. Requires capture_network=True, raises
+            ValueError otherwise
+        :param poster_details: Also read each author's user id, following and
+            followers from their hover card. Authors are cached in self.profiles,
+            so each is hovered at most once. Not available with graphql
         """
-        url = f"https://twitter.com/search?q={query}&src=typed_query"
-        self.driver.get(url)
-        time.sleep(3)
+        if graphql and not self.capture_network:
+            raise ValueError("scrapeSearch(graphql=True) needs capture_network=True")
 
-        try:
-            accept_cookies_btn = self.driver.find_element(
-                By.XPATH, "//span[text()='Refuse non-essential cookies']/../../.."
-            )
-            accept_cookies_btn.click()
-        except NoSuchElementException:
-            pass
+        self.poster_details = poster_details
+        if graphql:
+            self._scrapeTimeline(query, tweetCount)
+            if self.lean:
+                self.lean.record(self.driver, page=query)
+            return
+
+        self._openSearch(query)
 
         added_tweets = 0
 
         while self.scroller.scrolling and added_tweets < tweetCount:
+            if batch:
+                added_tweets += self._scrapeBatch(tweetCount - added_tweets)
+                continue
+
             try:
                 self._getXPosts()
 
                 for card in self.posts[-15:]:
                     try:
-                        tweet_id = str(card)
-                        if tweet_id not in self.postsId:
-                            self.postsId.add(tweet_id)
+                        tweet_id = card_tweet_id(card)
+                        if tweet_id and tweet_id not in self.postsId:
 
                             tweet = Tweet(
                                 card=card,
                                 driver=self.driver,
                                 actions=self.actions,
-                                scrape_poster_details=False,
+                                scrape_poster_details=self.poster_details,
+                                profile_cache=self.profiles,
                             )
 
-                            if not tweet.is_ad:
+                            if not tweet.is_ad and self.postsId.add(tweet_id):
                                 self.data.append(tweet.tweet)
                                 added_tweets += 1
                                 print(self.data[added_tweets - 1])
 
-                            self.driver.execute_script("scrollBy(0,600)")
-                            time.sleep(1)
+                            self.scroller.scroll(by=600)
                     except Exception as e:
                         print(e)
             except Exception as e:
                 print(e)
 
+        print(f"{query}: {added_tweets} tweets, scrolling {self.scroller.stats()}")
+        if poster_details:
+            print(f"{query}: poster details {self.profiles.stats()}")
+        if self.lean:
+            self.lean.record(self.driver, page=query)
+
+    def _openSearch(self, query: str) -> None:
+        """
+        Loads the search results page for a query and dismisses the cookie banner.
+
+        :param query: Search query string
+        """
+        self.driver.get(self.SEARCH_URL.format(query=query))
+        self.scroller.reset()
+        self.scroller.wait_for_cards()
+
+        try:
+            accept_cookies_btn = self.driver.find_element(
+                By.XPATH, "//span[text()='Refuse non-essential cookies']/../../.."
+            )
+            accept_cookies_btn.click()
+        except NoSuchElementException:
+            pass
+
+    def _scrapeTimeline(self, query: str, tweetCount: int, patience: int = 5) -> None:
+        """
+        Scrapes search results from the SearchTimeline GraphQL responses.
+
+        Every page of results is parsed in bulk as it arrives while the page is
+        scrolled, and tweets are deduplicated by their rest_id.
+
+        :param query: Search query string
+        :param tweetCount: Amount of posts to be scraped
+        :param patience: Number of consecutive scrolls without new tweets before
+            the timeline is considered exhausted
+        """
+        capture = TimelineCapture(self.driver, "SearchTimeline")
+        self._openSearch(query)
+
+        added_tweets = 0
+        idle = 0
+
+        while self.scroller.scrolling and added_tweets < tweetCount and idle < patience:
+            new_tweets = 0
+            try:
+                for page in capture.poll():
+                    for payload in parse_search_timeline(page):
+                        if added_tweets >= tweetCount:
+                            break
+                        if payload["tweet_id"] in self.postsId:
+                            continue
+
+                        tweet = Tweet(
+                            card=None,
+                            driver=self.driver,
+                            actions=self.actions,
+                            payload=payload,
+                        )
+
+                        if not tweet.error and self.postsId.add(payload["tweet_id"]):
+                            self.data.append(tweet.tweet)
+                            added_tweets += 1
+                            new_tweets += 1
+            except Exception as e:
+                print(e)
+
+            idle = 0 if new_tweets else idle + 1
+            self.scroller.scroll()
+
+    def _scrapeBatch(self, remaining: int) -> int:
+        """
+        Extracts every visible tweet with a single browser call and keeps the new ones.
+
+        :param remaining: Maximum number of tweets to add
+        :return: Number of tweets added
+        """
+        added = 0
+        try:
+            payloads = extract_tweets(self.driver, exclude=self.postsId.recent_ids())
+        except Exception as e:
+            print(e)
+            return added
+
+        for payload in payloads:
+            if added >= remaining:
+                break
+            try:
+                tweet_id = payload.get("tweet_id")
+                if not tweet_id or tweet_id in self.postsId:
+                    continue
+
+                tweet = Tweet(
+                    card=payload["card"],
+                    driver=self.driver,
+                    actions=self.actions,
+                    scrape_poster_details=self.poster_details,
+                    payload=payload,
+                    profile_cache=self.profiles,
+                )
+
+                if not tweet.is_ad and self.postsId.add(tweet_id):
+                    self.data.append(tweet.tweet)
+                    added += 1
+                    print(self.data[-1])
+            except Exception as e:
+                print(e)
+
+        self.scroller.scroll(by=600 * max(added, 1))
+        return added
+
     def _getXPosts(self) -> None:
         """
         Retrieves tweet elements from the current page.
         """
-        self.posts = self.driver.find_elements(
-            By.CSS_SELECTOR, 'article[data-testid="tweet"]'
-        )
+        self.posts = self.driver.find_elements(By.CSS_SELECTOR, TWEET_SELECTOR)
 
     def getSample(self) -> None:
         """
         Retrieves a small sample of tweets from the Twitter homepage.
         """
-        self.driver.get("https://twitter.com/")
-        time.sleep(3)
+        self.driver.get(self.HOME_URL)
+        self.scroller.reset()
+        self.scroller.wait_for_cards()
 
         self._getXPosts()
 
@@ -153,25 +393,28 @@ class XScraper:
         :param card: Web element representing a tweet
         """
         try:
-            tweet_id = str(card)
-            if tweet_id not in self.postsId:
-                self.postsId.add(tweet_id)
+            tweet_id = card_tweet_id(card)
+            if tweet_id and tweet_id not in self.postsId:
                 tweet = Tweet(
                     card=card,
                     driver=self.driver,
                     actions=self.actions,
-                    scrape_poster_details=False,
+                    scrape_poster_details=self.poster_details,
+                    profile_cache=self.profiles,
                 )
-                if not tweet.is_ad:
+                if not tweet.is_ad and self.postsId.add(tweet_id):
                     self.data.append(tweet.tweet)
                     print(self.data[-1])
         except Exception as e:
             print(e)
 
-    def save_to_csv(self) -> None:
+    def save_to_csv(self, tweets: list = None) -> None:
         """
         Saves the scraped tweets to a CSV file.
+
+        :param tweets: Tweets to save instead of this scraper's own data
         """
+        tweets = self.data if tweets is None else tweets
         now = datetime.now()
         folder_path = "./tweets/"
 
@@ -180,17 +423,22 @@ class XScraper:
 
         print("Saving data...")
         data = {
-            "Name": [tweet[0] for tweet in self.data],
-            "Handle": [tweet[1] for tweet in self.data],
-            "Timestamp": [tweet[2] for tweet in self.data],
-            "Content": [tweet[4] for tweet in self.data],
-            "Retweets": [tweet[6] for tweet in self.data],
-            "Likes": [tweet[7] for tweet in self.data],
-            "Views": [tweet[8] for tweet in self.data],
-            "Tweet Link": [tweet[13] for tweet in self.data],
+            "Name": [tweet[0] for tweet in tweets],
+            "Handle": [tweet[1] for tweet in tweets],
+            "Timestamp": [tweet[2] for tweet in tweets],
+            "Content": [tweet[4] for tweet in tweets],
+            "Retweets": [tweet[6] for tweet in tweets],
+            "Likes": [tweet[7] for tweet in tweets],
+            "Views": [tweet[8] for tweet in tweets],
+            "Tweet Link": [tweet[13] for tweet in tweets],
         }
+        if any(tweet[15] is not None for tweet in tweets):
+            data["User ID"] = [tweet[15] for tweet in tweets]
+            data["Following"] = [tweet[16] for tweet in tweets]
+            data["Followers"] = [tweet[17] for tweet in tweets]
 
         df = pd.DataFrame(data)
         current_time = now.strftime("%Y-%m-%d_%H-%M-%S")
-        file_path = f"{folder_path}{current_time}_tweets_1-{len(self.data)}.csv"
+        file_path = f"{folder_path}{current_time}_tweets_1-{len(tweets)}.csv"
         df.to_csv(file_path, index=False, encoding="utf-8")
+        self.postsId.flush()
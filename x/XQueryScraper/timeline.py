@@ -0,0 +1,179 @@
+"""Helpers for reading X's GraphQL timeline responses instead of the rendered DOM.
+
+The browser has to be started with Chrome's performance log enabled
+("goog:loggingPrefs": {"performance": "ALL"}) so that network events can be
+read back through the driver.
+
+Classes:
+    TimelineCapture: Collects the JSON bodies of one GraphQL operation from the network log.
+
+Functions:
+    parse_search_timeline: Turns one SearchTimeline page into Tweet payload dicts.
+    parse_tweet_result: Turns one tweet result object into a Tweet payload dict.
+"""
+
+import json
+from datetime import datetime
+
+import jmespath
+from selenium.common.exceptions import WebDriverException
+
+TWEET_FIELDS = jmespath.compile("""{
+    rest_id: rest_id,
+    user: core.user_results.result.legacy.name || core.user_results.result.core.name,
+    handle: core.user_results.result.legacy.screen_name || core.user_results.result.core.screen_name,
+    created_at: legacy.created_at,
+    blue_verified: core.user_results.result.is_blue_verified,
+    verified: core.user_results.result.legacy.verified,
+    text: note_tweet.note_tweet_results.result.text || legacy.full_text,
+    reply_count: legacy.reply_count,
+    retweet_count: legacy.retweet_count,
+    like_count: legacy.favorite_count,
+    view_count: views.count,
+    hashtags: legacy.entities.hashtags[].text,
+    mentions: legacy.entities.user_mentions[].screen_name,
+    profile_img: core.user_results.result.legacy.profile_image_url_https || core.user_results.result.avatar.image_url
+    }""")
+
+TIMELINE_ENTRIES = jmespath.compile(
+    "search_by_raw_query.search_timeline.timeline.instructions[].entries[]"
+)
+
+TWEET_RESULT = jmespath.compile("itemContent.tweet_results.result")
+
+
+class TimelineCapture:
+    """Reads the responses of a single GraphQL operation from Chrome's performance log.
+
+    Response bodies can only be fetched once Chrome reports the request as finished,
+    so request ids seen in Network.responseReceived are kept until the matching
+    Network.loadingFinished event arrives.
+
+    Attributes:
+        driver: A Chrome WebDriver started with performance logging enabled.
+        operation: The GraphQL operation name to match in the request URL.
+        pending: Request ids of matching responses whose body is not yet available.
+    """
+
+    def __init__(self, driver, operation: str = "SearchTimeline") -> None:
+        self.driver = driver
+        self.operation = operation
+        self.pending = set()
+
+    def poll(self) -> list:
+        """
+        Drain the performance log and fetch the bodies of finished matching responses.
+
+        Returns:
+            list: The decoded JSON bodies, in the order their requests finished.
+        """
+        bodies = []
+        for entry in self.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+
+            if method == "Network.responseReceived":
+                if f"/{self.operation}" in params["response"]["url"]:
+                    self.pending.add(params["requestId"])
+
+            elif method == "Network.loadingFinished":
+                request_id = params["requestId"]
+                if request_id not in self.pending:
+                    continue
+                self.pending.discard(request_id)
+
+                try:
+                    body = self.driver.execute_cdp_cmd(
+                        "Network.getResponseBody", {"requestId": request_id}
+                    )
+                    bodies.append(json.loads(body["body"]))
+                except (WebDriverException, ValueError) as e:
+                    print(f"Could not read {self.operation} response: {e}")
+
+        return bodies
+
+
+def _to_int(value) -> int:
+    """Convert a GraphQL count (int, numeric string or missing) to an int."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def parse_tweet_result(result: dict) -> dict:
+    """Parse one tweet_results.result object into a Tweet payload dict.
+
+    Args:
+        result: The tweet object as found under tweet_results.result.
+
+    Returns:
+        dict: A payload in the same shape as extract_tweets produces, with exact
+        integer counts and the tweet's rest_id under "tweet_id", or None if the
+        result is not a readable tweet (e.g. tombstones).
+    """
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet", {})
+
+    fields = TWEET_FIELDS.search(result)
+    if not fields or not fields["rest_id"] or not fields["created_at"]:
+        return None
+
+    created = datetime.strptime(fields["created_at"], "%a %b %d %H:%M:%S %z %Y")
+    handle = fields["handle"] or ""
+
+    return {
+        "card": None,
+        "tweet_id": fields["rest_id"],
+        "user": fields["user"],
+        "handle": f"@{handle}" if handle else None,
+        "date_time": created.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+        "verified": bool(fields["blue_verified"] or fields["verified"]),
+        "content": fields["text"] or "",
+        "reply_cnt": _to_int(fields["reply_count"]),
+        "retweet_cnt": _to_int(fields["retweet_count"]),
+        "like_cnt": _to_int(fields["like_count"]),
+        "analytics_cnt": _to_int(fields["view_count"]),
+        "tags": [f"#{tag}" for tag in fields["hashtags"] or []],
+        "mentions": [f"@{name}" for name in fields["mentions"] or []],
+        "emojis": [],
+        "profile_img": fields["profile_img"] or "",
+        "tweet_link": f"https://x.com/{handle}/status/{fields['rest_id']}",
+    }
+
+
+def parse_search_timeline(data: dict) -> list:
+    """Parse every tweet in one SearchTimeline response.
+
+    Args:
+        data: The decoded JSON body of a SearchTimeline GraphQL response.
+
+    Returns:
+        list: Tweet payload dicts in timeline order. Promoted tweets, cursors and
+        other non-tweet entries are skipped.
+    """
+    entries = TIMELINE_ENTRIES.search(data.get("data", {})) or []
+
+    results = []
+    for entry in entries:
+        # Ads, which the DOM path drops through Tweet.is_ad
+        if entry.get("entryId", "").startswith("promoted-"):
+            continue
+        content = entry.get("content", {})
+        items = [content] + [item.get("item", {}) for item in content.get("items", [])]
+
+        for item in items:
+            if "promotedMetadata" in item.get("itemContent", {}):
+                continue
+            result = TWEET_RESULT.search(item)
+            if result:
+                results.append(result)
+
+    payloads = []
+    for result in results:
+        payload = parse_tweet_result(result)
+        if payload is not None:
+            payloads.append(payload)
+
+    return payloads
@@ -0,0 +1,185 @@
+"""Micro-benchmark of parse_tweet_detail against per-tweet jmespath.search calls.
+
+Parses TweetDetail responses with the batch parser and with the previous
+approach (a jmespath expression string searched once per tweet), and prints
+tweets parsed per second for each.
+
+Recorded responses can be passed with --fixture (the JSON bodies of TweetDetail
+or TweetResultByRestId calls, e.g. saved from the browser's network tab).
+Without them a synthetic response shaped like TweetDetail is generated.
+
+Usage:
+    python bench_parser.py --replies 200 --related 20 --repeat 200
+    python bench_parser.py --fixture detail1.json detail2.json
+"""
+
+import argparse
+import json
+import random
+import time
+
+import jmespath
+
+from singlePostScraper import DETAIL_PATHS, parse_tweet_detail, to_arrow
+
+# DETAIL_PATHS as a jmespath multiselect, as parse_tweet used to search it
+LEGACY_EXPRESSION = (
+    "{" + ", ".join(f"{name}: {path}" for name, path in DETAIL_PATHS.items()) + "}"
+)
+
+
+def legacy_parse(data):
+    """Per-tweet parsing as before: one uncompiled jmespath.search per tweet."""
+    rows = []
+    instructions = jmespath.search(
+        "data.threaded_conversation_with_injections_v2.instructions", data
+    )
+    for instruction in instructions or []:
+        for entry in instruction.get("entries", []):
+            results = jmespath.search(
+                "[content.itemContent.tweet_results.result,"
+                " content.items[].item.itemContent.tweet_results.result][][]",
+                entry,
+            )
+            for result in results or []:
+                if result:
+                    rows.append(jmespath.search(LEGACY_EXPRESSION, result))
+    return rows
+
+
+def make_tweet(rng, tweet_id, reply_to=None, quote=None):
+    tweet = {
+        "__typename": "Tweet",
+        "rest_id": str(tweet_id),
+        "core": {
+            "user_results": {
+                "result": {
+                    "rest_id": str(rng.randrange(10**9)),
+                    "legacy": {"screen_name": f"user{rng.randrange(5000)}"},
+                }
+            }
+        },
+        "views": {"count": str(rng.randrange(10**6)), "state": "EnabledWithCount"},
+        "legacy": {
+            "full_text": f"tweet {tweet_id} " + "lorem ipsum " * rng.randrange(1, 20),
+            "created_at": "Wed Oct 18 12:00:00 +0000 2023",
+            "conversation_id_str": "1",
+            "in_reply_to_status_id_str": reply_to,
+            "user_id_str": str(rng.randrange(10**9)),
+            "reply_count": rng.randrange(100),
+            "retweet_count": rng.randrange(1000),
+            "favorite_count": rng.randrange(10000),
+            "quote_count": rng.randrange(50),
+            "bookmark_count": rng.randrange(50),
+        },
+    }
+    if quote is not None:
+        tweet["quoted_status_result"] = {"result": quote}
+    return tweet
+
+
+def make_response(replies, related, seed=0):
+    """A TweetDetail response with one parent, its replies and related tweets."""
+    rng = random.Random(seed)
+    ids = iter(range(2, 10**9))
+
+    def maybe_quote():
+        return make_tweet(rng, next(ids)) if rng.random() < 0.1 else None
+
+    entries = [
+        {
+            "entryId": "tweet-1",
+            "content": {
+                "itemContent": {
+                    "tweet_results": {"result": make_tweet(rng, 1, quote=maybe_quote())}
+                }
+            },
+        }
+    ]
+    for _ in range(replies):
+        tweet_id = next(ids)
+        result = make_tweet(rng, tweet_id, reply_to="1", quote=maybe_quote())
+        entries.append(
+            {
+                "entryId": f"conversationthread-{tweet_id}",
+                "content": {
+                    "items": [
+                        {"item": {"itemContent": {"tweet_results": {"result": result}}}}
+                    ]
+                },
+            }
+        )
+    entries.append(
+        {
+            "entryId": "tweetdetailrelatedtweets-1",
+            "content": {
+                "items": [
+                    {
+                        "item": {
+                            "itemContent": {
+                                "tweet_results": {"result": make_tweet(rng, next(ids))}
+                            }
+                        }
+                    }
+                    for _ in range(related)
+                ]
+            },
+        }
+    )
+    entries.append({"entryId": "cursor-bottom-1", "content": {"value": "cursor"}})
+
+    return {
+        "data": {
+            "threaded_conversation_with_injections_v2": {
+                "instructions": [{"type": "TimelineAddEntries", "entries": entries}]
+            }
+        }
+    }
+
+
+def timed(function, responses, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for response in responses:
+            result = function(response)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parse_tweet_detail.")
+    parser.add_argument("--fixture", nargs="*", default=[])
+    parser.add_argument("--replies", type=int, default=100)
+    parser.add_argument("--related", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.fixture:
+        responses = []
+        for path in args.fixture:
+            with open(path, "r", encoding="utf-8") as file:
+                responses.append(json.load(file))
+    else:
+        responses = [make_response(args.replies, args.related)]
+
+    tweets = sum(len(parse_tweet_detail(r)["tweet_id"]) for r in responses)
+    print(f"{len(responses)} responses, {tweets} tweets, {args.repeat} repeats")
+
+    seconds, _ = timed(parse_tweet_detail, responses, args.repeat)
+    rate = tweets * args.repeat / seconds
+    print(f"parse_tweet_detail: {seconds:.2f}s ({rate:,.0f} tweets/s)")
+
+    legacy_tweets = sum(len(legacy_parse(r)) for r in responses)
+    legacy, _ = timed(legacy_parse, responses, args.repeat)
+    legacy_rate = legacy_tweets * args.repeat / legacy
+    print(
+        f"per-tweet search:   {legacy:.2f}s ({legacy_rate:,.0f} tweets/s,"
+        f" {legacy_tweets} tweets without quoted)"
+    )
+    print(f"speedup:            {rate / legacy_rate:.1f}x per tweet")
+
+    try:
+        columns = [parse_tweet_detail(r) for r in responses]
+        arrow, _ = timed(to_arrow, columns, args.repeat)
+        print(f"to_arrow:           {arrow:.2f}s")
+    except ImportError:
+        pass
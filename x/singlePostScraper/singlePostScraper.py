@@ -1,12 +1,123 @@
-from typing import Dict
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Dict, Iterable
 import jmespath
+from playwright.async_api import async_playwright
 from playwright.sync_api import sync_playwright
 
+# The GraphQL call that carries the tweet a /status/ page is opened for
+TWEET_RESPONSE_PATTERN = "TweetResultByRestId"
+
+# Nothing the batch scraper reads comes from these, so they are never fetched
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# Compiled once here instead of parsed again on every call
+TWEET_FIELDS = jmespath.compile("""{
+    text: legacy.full_text,
+    created_at: legacy.created_at,
+    user_id: legacy.user_id_str,
+    like_count: legacy.favorite_count,
+    retweet_count: legacy.retweet_count,
+    view_count: views.count,
+    quote_count: legacy.quote_count
+    }""")
+
+# Field -> path of the value in a tweet result. As in jmespath, "a || b" takes
+# the first truthy alternative.
+DETAIL_PATHS = {
+    "tweet_id": "rest_id",
+    "conversation_id": "legacy.conversation_id_str",
+    "in_reply_to_id": "legacy.in_reply_to_status_id_str",
+    "user_id": "legacy.user_id_str",
+    "handle": "core.user_results.result.legacy.screen_name"
+    " || core.user_results.result.core.screen_name",
+    "created_at": "legacy.created_at",
+    "text": "note_tweet.note_tweet_results.result.text || legacy.full_text",
+    "reply_count": "legacy.reply_count",
+    "retweet_count": "legacy.retweet_count",
+    "like_count": "legacy.favorite_count",
+    "quote_count": "legacy.quote_count",
+    "bookmark_count": "legacy.bookmark_count",
+    "view_count": "views.count",
+}
+
+DETAIL_INSTRUCTIONS = jmespath.compile(
+    "threaded_conversation_with_injections_v2.instructions"
+)
+
+TWEET_RESULT_BY_REST_ID = jmespath.compile("tweetResult.result")
+
+COUNT_COLUMNS = (
+    "reply_count",
+    "retweet_count",
+    "like_count",
+    "quote_count",
+    "bookmark_count",
+    "view_count",
+)
+
+DETAIL_COLUMNS = (
+    "kind",
+    "tweet_id",
+    "quoted_by",
+    "conversation_id",
+    "in_reply_to_id",
+    "user_id",
+    "handle",
+    "created_at",
+    "text",
+) + COUNT_COLUMNS
+
+
+def _compile_paths(paths: Dict[str, str]):
+    """
+    Compile DETAIL_PATHS-style paths into a function that extracts them all.
+
+    The paths are split into key tuples once, so extracting a tweet is only
+    dict lookups. This is several times faster than a jmespath multiselect, which
+    walks its parsed expression tree for every tweet.
+    """
+    compiled = [
+        (
+            name,
+            [tuple(alternative.strip().split(".")) for alternative in path.split("||")],
+        )
+        for name, path in paths.items()
+    ]
+
+    def extract(obj: Dict) -> Dict:
+        fields = {}
+        for name, alternatives in compiled:
+            value = None
+            for keys in alternatives:
+                value = obj
+                for key in keys:
+                    value = value.get(key) if isinstance(value, dict) else None
+                    if value is None:
+                        break
+                if value:
+                    break
+            fields[name] = value
+        return fields
+
+    return extract
+
+
+DETAIL_FIELDS = _compile_paths(DETAIL_PATHS)
+
+# TweetDetail entry id prefix -> kind of the tweets in the entry
+ENTRY_KINDS = {
+    "tweet": "parent",
+    "conversationthread": "reply",
+    "tweetdetailrelatedtweets": "related",
+}
+
 
 def scrape_tweet(url: str) -> dict:
     """
     Scrape a single tweet page for Tweet thread e.g.:
-   
+
     Return parent tweet, reply tweets and recommended tweets
     """
     _xhr_calls = []
@@ -33,34 +144,279 @@ def scrape_tweet(url: str) -> dict:
         tweet_calls = [f for f in _xhr_calls if "TweetResultByRestId" in f.url]
         for xhr in tweet_calls:
             data = xhr.json()
-            return data['data']['tweetResult']['result']
-    
-    
-    
+            return data["data"]["tweetResult"]["result"]
+
 
 def parse_tweet(data: Dict) -> Dict:
     """Parse Twitter tweet JSON dataset for the most important fields"""
-    result = jmespath.search(
-        """{
-        text: legacy.full_text,
-        created_at: legacy.created_at,
-        user_id: legacy.user_id_str,
-        like_count: legacy.favorite_count,
-        retweet_count: legacy.retweet_count,
-        view_count: views.count,
-        quote_count: legacy.quote_count
-        }""",
-        data,
-    )
-    
+    return TWEET_FIELDS.search(data)
+
+
+def _to_int(value) -> int:
+    """convert a GraphQL count (int, numeric string or missing) to an int"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _unwrap(result: Dict) -> Dict:
+    """return the tweet inside a tweet_results.result, or None for tombstones"""
+    if result and result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet")
+    if not result or "rest_id" not in result:
+        return None
     return result
-        
-        
-        
+
+
+def _entry_items(entry: Dict) -> list:
+    """the itemContent objects of a timeline entry, whether single or a module"""
+    content = entry.get("content", {})
+    if "itemContent" in content:
+        return [content["itemContent"]]
+    return [
+        item.get("item", {}).get("itemContent", {}) for item in content.get("items", [])
+    ]
+
+
+def parse_tweet_detail(data: Dict, focal_id: str = None) -> Dict[str, list]:
+    """
+    Parse every tweet of a TweetDetail (or TweetResultByRestId) response into columns.
+
+    The response is walked once and each tweet becomes one row, tagged in the
+    "kind" column as:
+        parent   - the tweet the page was opened for
+        ancestor - tweets above it in the thread
+        reply    - replies, including those loaded with "show more"
+        related  - recommended tweets
+        quoted   - the tweet quoted by another row, whose id is in "quoted_by"
+    Tweets that appear more than once are kept once. Counts are ints.
+
+    focal_id is the tweet the page was opened for; without it the last top
+    level tweet entry is taken as the parent.
+
+    Returns a dict of DETAIL_COLUMNS -> list, see to_arrow for an Arrow table.
+    """
+    columns = {name: [] for name in DETAIL_COLUMNS}
+    seen = set()
+
+    def add(result, kind, quoted_by=None):
+        tweet = _unwrap(result)
+        if tweet is None or tweet["rest_id"] in seen:
+            return None
+        seen.add(tweet["rest_id"])
+
+        fields = DETAIL_FIELDS(tweet)
+        for name in COUNT_COLUMNS:
+            fields[name] = _to_int(fields[name])
+        fields["kind"] = kind
+        fields["quoted_by"] = quoted_by
+        for name, column in columns.items():
+            column.append(fields[name])
+
+        quoted = tweet.get("quoted_status_result")
+        if quoted:
+            add(quoted.get("result"), "quoted", tweet["rest_id"])
+        return len(columns["kind"]) - 1
+
+    data = data.get("data", data)
+    single = TWEET_RESULT_BY_REST_ID.search(data)
+    if single:
+        add(single, "parent")
+        return columns
+
+    top_level = []
+    for instruction in DETAIL_INSTRUCTIONS.search(data) or []:
+        entries = instruction.get("entries") or []
+        if "entry" in instruction:
+            entries = [instruction["entry"]]
+
+        for entry in entries:
+            entry_id = entry.get("entryId", "")
+            kind = ENTRY_KINDS.get(entry_id.split("-", 1)[0])
+            if kind is None:
+                continue
+            for item in _entry_items(entry):
+                row = add(item.get("tweet_results", {}).get("result"), kind)
+                if row is not None and kind == "parent":
+                    top_level.append(row)
+
+        for module_item in instruction.get("moduleItems", []):
+            item = module_item.get("item", {}).get("itemContent", {})
+            add(item.get("tweet_results", {}).get("result"), "reply")
+
+    if focal_id is None and top_level:
+        focal_id = columns["tweet_id"][top_level[-1]]
+    for row in top_level:
+        if columns["tweet_id"][row] != focal_id:
+            columns["kind"][row] = "ancestor"
+
+    return columns
+
+
+def to_arrow(columns: Dict[str, list]):
+    """turn parse_tweet_detail output into a pyarrow Table"""
+    import pyarrow as pa  # optional dependency, only needed for Arrow output
+
+    return pa.table(
+        {
+            name: pa.array(values, pa.int64() if name in COUNT_COLUMNS else pa.string())
+            for name, values in columns.items()
+        }
+    )
+
+
+async def _block_resources(route):
+    """abort requests for resources the tweet JSON does not need"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _new_context(browser):
+    context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+    await context.route("**/*", _block_resources)
+    return context
+
+
+def _is_tweet_response(response) -> bool:
+    return TWEET_RESPONSE_PATTERN in response.url and response.ok
+
+
+async def _fetch_tweet(context, url: str, timeout: float) -> dict:
+    """
+    Open a tweet page and return the tweet from its TweetResultByRestId response.
+
+    Only that response is waited for: the page is closed as soon as it arrives,
+    without waiting for the page to load or render.
+    """
+    page = await context.new_page()
+    try:
+        async with page.expect_response(
+            _is_tweet_response, timeout=timeout * 1000
+        ) as response_info:
+            await page.goto(url, wait_until="commit", timeout=timeout * 1000)
+        response = await response_info.value
+        data = await response.json()
+        return data["data"]["tweetResult"]["result"]
+    finally:
+        await page.close()
+
+
+async def _worker(browser, urls, results, timeout, pages_per_context):
+    """
+    Scrape urls from the queue with one browser context until a None arrives.
+
+    The context is replaced every pages_per_context pages so its cache and
+    cookies do not grow without bound.
+    """
+    context = None
+    pages = 0
+    try:
+        while True:
+            url = await urls.get()
+            if url is None:
+                return
+            try:
+                if context is None or pages >= pages_per_context:
+                    if context is not None:
+                        await context.close()
+                    context = await _new_context(browser)
+                    pages = 0
+                pages += 1
+                tweet = parse_tweet(await _fetch_tweet(context, url, timeout))
+                await results.put({"url": url, "tweet": tweet, "error": None})
+            except Exception as e:
+                await results.put({"url": url, "tweet": None, "error": str(e)})
+    finally:
+        if context is not None:
+            await context.close()
+
+
+async def scrape_tweets(
+    urls: Iterable[str],
+    concurrency: int = 8,
+    headless: bool = True,
+    timeout: float = 30,
+    pages_per_context: int = 50,
+) -> AsyncIterator[dict]:
+    """
+    Scrape many tweet pages with one browser and a pool of contexts.
+
+    Each of the `concurrency` workers owns a browser context and opens one
+    page at a time in it. Results are yielded as soon as each tweet arrives,
+    so they are not in the order of urls:
+
+        {"url": ..., "tweet": parse_tweet(...) or None, "error": None or str}
+
+    e.g.:
+        async for result in scrape_tweets(urls, concurrency=16):
+            print(result["tweet"])
+    """
+    urls = list(urls)
+    workers = max(1, min(concurrency, len(urls)))
+
+    queue = asyncio.Queue()
+    for url in urls:
+        queue.put_nowait(url)
+    for _ in range(workers):
+        queue.put_nowait(None)
+    results = asyncio.Queue()
+
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=headless)
+        tasks = [
+            asyncio.create_task(
+                _worker(browser, queue, results, timeout, pages_per_context)
+            )
+            for _ in range(workers)
+        ]
+        try:
+            for _ in range(len(urls)):
+                yield await results.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await browser.close()
+
+
+def scrape_tweets_to_jsonl(
+    urls: Iterable[str], output_path: str, concurrency: int = 8, **kwargs
+) -> int:
+    """
+    Run scrape_tweets and append every result to a JSON lines file as it arrives.
+
+    Returns the number of tweets scraped successfully.
+    """
+
+    async def run():
+        scraped = failed = 0
+        start = time.monotonic()
+        with open(output_path, "a", encoding="utf-8") as file:
+            async for result in scrape_tweets(urls, concurrency, **kwargs):
+                if result["error"]:
+                    failed += 1
+                    print(f"{result['url']}: {result['error']}")
+                else:
+                    scraped += 1
+                file.write(json.dumps(result, ensure_ascii=False) + "\n")
+                file.flush()
+        elapsed = time.monotonic() - start
+        print(
+            f"{scraped} tweets, {failed} failed in {elapsed:.0f}s "
+            f"({scraped / elapsed if elapsed else 0:.1f} tweets/s)"
+        )
+        return scraped
+
+    return asyncio.run(run())
+
+
 if __name__ == "__main__":
     res = scrape_tweet("https://x.com/search?q=Gun Control&src=typed_query")
-    
+
     a = parse_tweet(res)
-    
+
     with open("output.txt", "w", encoding="utf-8") as file:
-        file.write(str(a))
\ No newline at end of file
+        file.write(str(a))